@@ -1,6 +1,8 @@
 import pygame
 import os
+import math
 import numpy as np
+from collections import OrderedDict
 from settings import *
 
 BASE_PATH = r"D:\Project\Hell's Grid\assets"
@@ -19,11 +21,14 @@ def load_custom_font(size):
     except:
         return pygame.font.SysFont('Arial', size, bold=True)
 
-def load_texture(filename):
+def load_texture(filename, convert=True):
+    """(TEXTURE_SIZE, TEXTURE_SIZE, 3) pixels of an image file, magenta if it can't be read.
+    convert=False skips Surface.convert(), which touches the display and isn't safe off the main thread."""
     path = os.path.join(BASE_PATH, filename)
     if not os.path.exists(path): path = path.replace(".png", ".jpg")
     try:
-        img = pygame.image.load(path).convert()
+        img = pygame.image.load(path)
+        if convert: img = img.convert()
         img = pygame.transform.scale(img, (TEXTURE_SIZE, TEXTURE_SIZE))
         return pygame.surfarray.array3d(img)
     except:
@@ -31,15 +36,109 @@ def load_texture(filename):
         surf.fill((255, 0, 255))
         return pygame.surfarray.array3d(surf)
 
+def sprite_pixels(surf, size=SPRITE_TEX_SIZE):
+    """(size, size, 4) RGBA array of a sprite, alpha taken from its per-pixel alpha or colorkey."""
+    scaled = pygame.transform.scale(surf, (size, size))
+    rgba = np.empty((size, size, 4), dtype=np.uint8)
+    rgba[:, :, :3] = pygame.surfarray.array3d(scaled)
+    rgba[:, :, 3] = pygame.surfarray.array_alpha(scaled) if scaled.get_flags() & pygame.SRCALPHA else pygame.surfarray.array_colorkey(scaled)
+    return rgba
+
+class TextureAtlas:
+    """All wall textures in one compact uint8 (count, size, size, 3) block.
+
+    Texels are stored column-major ([id, tex_x, tex_y]) so the wall loop reads
+    contiguous bytes while it walks down a screen column. Grows on demand.
+    """
+    def __init__(self, size=TEXTURE_SIZE, capacity=10):
+        self.size = size
+        self.textures = np.zeros((capacity, size, size, 3), dtype=np.uint8)
+
+    def add(self, index, pixels):
+        if index >= len(self.textures):
+            grown = np.zeros((max(index + 1, 2 * len(self.textures)), self.size, self.size, 3), dtype=np.uint8)
+            grown[:len(self.textures)] = self.textures
+            self.textures = grown
+        self.textures[index] = pixels
+
+class SpriteCache:
+    """Scaled copies of sprite Surfaces for the legacy sprite path, evicted LRU under a byte budget.
+
+    Heights snap to SPRITE_CACHE_STEPS sizes per doubling, so an enemy walking
+    towards the camera reuses a few dozen Surfaces instead of calling
+    transform.scale every frame. Anything bigger than the budget is scaled
+    exactly and not kept (budget=0 turns the cache off).
+    """
+    def __init__(self, budget=SPRITE_CACHE_BUDGET, steps=SPRITE_CACHE_STEPS):
+        self.budget, self.steps = budget, steps
+        self.entries = OrderedDict() # (name, bucket) -> Surface, least recently used first
+        self.bytes = 0
+        self.hits = self.misses = 0
+
+    def bucket(self, height):
+        return round(math.log2(max(height, 1)) * self.steps)
+
+    def get(self, name, surf, width, height):
+        """`surf` scaled to roughly (width, height), keeping width/height proportional to the request."""
+        size = width * height * surf.get_bytesize()
+        if size > self.budget: return pygame.transform.scale(surf, (max(width, 0), max(height, 0)))
+        key = (name, self.bucket(height))
+        scaled = self.entries.get(key)
+        if scaled is not None:
+            self.entries.move_to_end(key); self.hits += 1
+            return scaled
+        self.misses += 1
+        h = max(1, round(2 ** (key[1] / self.steps)))
+        scaled = pygame.transform.scale(surf, (max(1, round(width * h / max(height, 1))), h))
+        self.entries[key] = scaled
+        self.bytes += scaled.get_width() * scaled.get_height() * scaled.get_bytesize()
+        while self.bytes > self.budget:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return scaled
+
+    def prewarm(self, name, surf, aspect, max_height=SPRITE_CACHE_PREWARM):
+        for b in range(self.bucket(max_height) + 1):
+            h = round(2 ** (b / self.steps))
+            self.get(name, surf, max(1, round(h * aspect)), h)
+        self.hits = self.misses = 0
+
 class AssetManager:
     def __init__(self):
         self.fonts = {}
         self.images = {}
-        self.wall_textures = None
+        self.atlas = TextureAtlas()
         self.floor_texture = None
         self.ceil_texture = None
         self.enemy_frames = []
         self.faces = {}
+        self.sprite_textures = None
+        self.sprite_ids = {}
+        self.sprite_aspect = {}
+        self.sprite_surfaces = {}
+        self.sprite_cache = SpriteCache()
+
+    @property
+    def wall_textures(self):
+        return self.atlas.textures
+
+    def scaled_sprite(self, name, width, height):
+        return self.sprite_cache.get(name, self.sprite_surfaces[name], width, height)
+
+    def level_textures(self, lvl):
+        """(wall_textures, floor, ceil) for a level dict: the shared set, or copies with the level's
+        optional TEXTURES overrides ({tile id / 'floor' / 'ceil': filename}) applied. Safe off the main thread:
+        overrides are decoded straight to arrays, without converting a Surface to the display format."""
+        atlas, floor, ceil = self.atlas, self.floor_texture, self.ceil_texture
+        overrides = lvl.get('TEXTURES', {})
+        if any(not isinstance(key, str) for key in overrides): # Private atlas, so overrides can grow it without touching the shared one
+            atlas = TextureAtlas(self.atlas.size, 0); atlas.textures = self.atlas.textures.copy()
+        for key, filename in overrides.items():
+            pixels = np.ascontiguousarray(load_texture(filename, convert=False), dtype=np.uint8)
+            if key == 'floor': floor = pixels
+            elif key == 'ceil': ceil = pixels
+            else: atlas.add(key, pixels)
+        return atlas.textures, floor, ceil
         
     def load_all(self):
         self.fonts['menu'] = load_custom_font(20)
@@ -79,10 +178,7 @@ class AssetManager:
             self.images['gun_fire'] = pygame.Surface((50,50))
 
         # Textures
-        max_textures = 10
-        self.wall_textures = np.zeros((max_textures, TEXTURE_SIZE, TEXTURE_SIZE, 3), dtype=np.int32)
-        def add_texture(index, filename):
-            if index < max_textures: self.wall_textures[index] = load_texture(filename)
+        def add_texture(index, filename): self.atlas.add(index, load_texture(filename))
 
         # --- WOODEN DOOR REMOVED ---
         # Both ID 3 and ID 4 now use the Red Switch door!
@@ -93,8 +189,8 @@ class AssetManager:
         add_texture(5, "wall3.png")
         add_texture(6, "wall switch2.png") # Activated Door (Green)
 
-        self.floor_texture = np.ascontiguousarray(load_texture("floor1.png"), dtype=np.int32)
-        self.ceil_texture = np.ascontiguousarray(load_texture("floor2.png"), dtype=np.int32)
+        self.floor_texture = np.ascontiguousarray(load_texture("floor1.png"), dtype=np.uint8)
+        self.ceil_texture = np.ascontiguousarray(load_texture("floor2.png"), dtype=np.uint8)
 
         # Enemy
         try:
@@ -123,6 +219,22 @@ class AssetManager:
             self.images['ammo_pickup'] = pygame.Surface((32, 32))
             self.images['armor_pickup'] = pygame.Surface((32, 32))
 
+        # Sprite sheet for the jitted sprite pass: every sprite resampled to one RGBA block
+        sheet = [('enemy0', self.enemy_frames[0]), ('enemy1', self.enemy_frames[1])]
+        sheet += [(name, self.images[name]) for name in ('health_pickup', 'ammo_pickup', 'armor_pickup')]
+        self.sprite_textures = np.zeros((len(sheet), SPRITE_TEX_SIZE, SPRITE_TEX_SIZE, 4), dtype=np.uint8)
+        for i, (name, surf) in enumerate(sheet):
+            self.sprite_ids[name] = i
+            self.sprite_aspect[name] = surf.get_width() / surf.get_height()
+            self.sprite_textures[i] = sprite_pixels(surf)
+            self.sprite_surfaces[name] = surf
+
+        # Scaled Surfaces for the legacy sprite path (enemies are drawn 0.7 tall, pickups square).
+        # The sprite kernel never draws them, so it leaves the cache to fill on first use.
+        if not SPRITE_KERNEL:
+            for name, surf in sheet:
+                self.sprite_cache.prewarm(name, surf, self.sprite_aspect[name] if name.startswith('enemy') else 1.0)
+
         for name, f in [('center','face.png'), ('left','face_left.png'), ('right','face_right.png')]:
             try: self.faces[name] = pygame.transform.scale(pygame.image.load(os.path.join(BASE_PATH, f)).convert_alpha(), (64,64))
             except: self.faces[name] = pygame.Surface((64,64))
@@ -0,0 +1,166 @@
+"""Headless engine benchmark.
+
+    python -m bench [--frames N] [--levels 0 1] [--out results.json]
+
+Runs under SDL's dummy video driver, replays a deterministic camera path
+through every level in levels.LEVELS (door-to-door walks with yaw sweeps and
+pitch swings, doors sliding open as the camera reaches them) and times each
+stage of the gameplay frame separately (`--flash` holds the damage flash on
+so the post-process stage has work). Prints JSON with p50/p95/p99 frame
+times per stage, so runs on different commits can be compared directly.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import subprocess
+import contextlib
+from collections import deque
+import numpy as np
+import pygame
+
+from settings import *
+import levels
+import raycaster
+import postfx
+
+STAGES = ["kernel", "present", "sprites", "postfx", "hud"]
+DOOR_IDS = (3, 4, 6)
+
+def passable(world_map, x, y):
+    return 0 <= x < world_map.shape[0] and 0 <= y < world_map.shape[1] and world_map[x, y] in (0,) + DOOR_IDS
+
+def bfs_route(world_map, start, goal):
+    """Shortest tile route from start to goal through open cells and doors (inclusive)."""
+    prev = {start: None}
+    queue = deque([start])
+    while queue:
+        cur = queue.popleft()
+        if cur == goal: break
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nxt = (cur[0] + dx, cur[1] + dy)
+            if nxt not in prev and passable(world_map, *nxt):
+                prev[nxt] = cur; queue.append(nxt)
+    if goal not in prev: return []
+    route, cur = [], goal
+    while cur is not None: route.append(cur); cur = prev[cur]
+    return route[::-1]
+
+def camera_route(game):
+    """Tile route that visits every door of the level (or its pickups when it has none), nearest first."""
+    world_map = game.world_map
+    start = (int(game.player_x // TILE_SIZE), int(game.player_y // TILE_SIZE))
+    targets = [tuple(int(v) for v in p) for p in np.argwhere(np.isin(world_map, DOOR_IDS))]
+    if not targets: targets = [(int(x // TILE_SIZE), int(y // TILE_SIZE)) for x, y in zip(game.pickups.x, game.pickups.y)]
+    route, cur = [start], start
+    while targets:
+        paths = [bfs_route(world_map, cur, t) for t in targets]
+        best = min((i for i in range(len(targets)) if paths[i]), key=lambda i: len(paths[i]), default=None)
+        if best is None: break
+        route += paths[best][1:]; cur = targets.pop(best)
+    return route
+
+def pose(route, i, frames):
+    """Camera (x, y, angle, pitch) for frame i: walk the route, look ahead, sweep and swing."""
+    t = (len(route) - 1) * i / max(1, frames - 1)
+    k = min(int(t), len(route) - 2) if len(route) > 1 else 0
+    a, b = route[k], route[min(k + 1, len(route) - 1)]
+    f = t - k
+    x = ((a[0] + (b[0] - a[0]) * f) + 0.5) * TILE_SIZE
+    y = ((a[1] + (b[1] - a[1]) * f) + 0.5) * TILE_SIZE
+    heading = math.atan2(b[1] - a[1], b[0] - a[0]) if a != b else 0.0
+    return x, y, heading + 0.9 * math.sin(i * 0.037), 0.6 * HALF_HEIGHT * math.sin(i * 0.023)
+
+def open_nearby_doors(game, doors):
+    """Doors slide open as the camera gets within two tiles, and close again behind it."""
+    if not len(doors): return
+    d = np.hypot((doors[:, 0] + 0.5) * TILE_SIZE - game.player_x, (doors[:, 1] + 0.5) * TILE_SIZE - game.player_y) / TILE_SIZE
+    game.door_state[doors[:, 0], doors[:, 1]] = np.clip(2.0 - d, 0.0, 1.0)
+
+def percentiles(samples):
+    a = np.asarray(samples)
+    return {"p50": round(float(np.percentile(a, 50)), 4), "p95": round(float(np.percentile(a, 95)), 4), "p99": round(float(np.percentile(a, 99)), 4), "mean": round(float(a.mean()), 4)}
+
+def run_level(game, index, frames, warmup, flash=0):
+    game.reset_game_data(level=index)
+    game.state = "game"
+    route = camera_route(game)
+    doors = np.argwhere(np.isin(game.world_map, DOOR_IDS))
+    times = {stage: [] for stage in STAGES + ["frame"]}
+
+    for i in range(-warmup, frames):
+        game.player_x, game.player_y, game.player_angle, game.player_pitch = pose(route, max(i, 0), frames)
+        open_nearby_doors(game, doors)
+        game.interpolate(1.0); game.damage_flash = flash
+        t0 = time.perf_counter()
+        rw, rh = game.render_world()
+        t1 = time.perf_counter()
+        if game.sprite_kernel: game.render_sprites(rw, rh)
+        t2 = time.perf_counter()
+        game.post_process(rw, rh)
+        t3 = time.perf_counter()
+        sx, sy = game.present_world(rw, rh); pygame.display.flip()
+        t4 = time.perf_counter()
+        if not game.sprite_kernel: game.draw_sprites(rw, sx, sy)
+        t5 = time.perf_counter()
+        game.draw_hud(sx, sy)
+        t6 = time.perf_counter()
+        if i < 0: continue
+        for stage, dt in zip(STAGES + ["frame"], (t1 - t0, t4 - t3, (t2 - t1) + (t5 - t4), t3 - t2, t6 - t5, t6 - t0)):
+            times[stage].append(dt * 1000.0)
+
+    return {"route_tiles": len(route), "frames": frames, "stages_ms": {stage: percentiles(v) for stage, v in times.items()}}
+
+def git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError: return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Hell's Grid engine benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per level")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed frames before each level")
+    parser.add_argument("--levels", type=int, nargs="*", help="level indices (default: all)")
+    parser.add_argument("--serial", action="store_true", help="use the single-threaded kernel")
+    parser.add_argument("--threads", type=int, default=RENDER_THREADS, help="kernel threads (0 = every core)")
+    parser.add_argument("--legacy-sprites", action="store_true", help="draw sprites with pygame.transform instead of the sprite pass")
+    parser.add_argument("--flash", type=int, default=0, help="hold the damage flash at this alpha (0-255) so the postfx stage has work")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    import main as game_main
+    with contextlib.redirect_stdout(sys.stderr): game = game_main.Game() # Keep stdout pure JSON
+    game.render_kernel = raycaster.select_kernel(parallel=not args.serial, threads=args.threads)
+    game.postfx_kernel = postfx.select_kernel(parallel=not args.serial)
+    game.sprite_kernel = not args.legacy_sprites
+    raycaster.warmup(game.render_kernel); postfx.warmup(game.postfx_kernel)
+    game.warmup_thread.join()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "kernel": "serial" if args.serial else "parallel",
+        "threads": 1 if args.serial else raycaster.numba.get_num_threads(),
+        "sprites": "kernel" if game.sprite_kernel else "legacy",
+        "resolution": [SCREEN_WIDTH, SCREEN_HEIGHT],
+        "flash": args.flash,
+        "levels": {},
+    }
+    for index in (args.levels if args.levels else range(len(levels.LEVELS))):
+        report["levels"][f"LEVEL_{index + 1}"] = run_level(game, index, args.frames, args.warmup, args.flash)
+    pygame.quit()
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f: f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
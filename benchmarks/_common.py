@@ -0,0 +1,47 @@
+"""Shared fixtures for the benchmark scripts: level arrays and textures without a window."""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import *
+import levels
+
+def load_level(index=0):
+    """Builds the same arrays as Game.init_map for levels.LEVELS[index]."""
+    import levelfile
+    level = levelfile.load(index)
+    world_map = level.tiles.astype(np.int32)
+    door_state = np.zeros(level.size, dtype=np.float32)
+    door_lock = np.zeros(level.size, dtype=np.int32)
+    return world_map, door_state, door_lock, level.door_dir.astype(np.int32)
+
+def make_textures(size=TEXTURE_SIZE, seed=1):
+    """Random wall / floor / ceiling textures in the layout AssetManager produces."""
+    rng = np.random.default_rng(seed)
+    walls = rng.integers(0, 256, (10, size, size, 3), dtype=np.uint8)
+    floor = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    ceil = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    return walls, floor, ceil
+
+def make_buffers():
+    """A (screen_buffer, depth_buffer) pair laid out like the game's."""
+    import raycaster
+    return raycaster.make_frame_buffer()[1], np.zeros(SCREEN_WIDTH, dtype=np.float32)
+
+# A handful of fixed camera poses in LEVEL_1: (x, y, angle, pitch)
+POSES = [
+    (2.5 * TILE_SIZE, 22.5 * TILE_SIZE, -np.pi / 2, 0.0),
+    (5.0 * TILE_SIZE, 10.0 * TILE_SIZE, 0.3, 40.0),
+    (12.0 * TILE_SIZE, 12.0 * TILE_SIZE, 2.0, -60.0),
+    (20.0 * TILE_SIZE, 3.0 * TILE_SIZE, 4.0, 10.0),
+]
+
+def time_frames(fn, frames):
+    """Calls fn(i) for every frame and returns the per-frame times in milliseconds."""
+    times = np.empty(frames)
+    for i in range(frames):
+        t0 = time.perf_counter(); fn(i); times[i] = (time.perf_counter() - t0) * 1000.0
+    return times
@@ -0,0 +1,54 @@
+"""Full-frame render cost against map size, with the DDA cut off at MAX_RAY_DIST.
+
+    python benchmarks/bench_bigmaps.py [frames] [max_ray_dist]
+
+maps:
+  maze   - 25% random walls: rays stop within a few tiles whatever the size
+  arena  - border walls and sparse pillars: rays cross the open floor until
+           they hit a pillar, the border or the MAX_RAY_DIST cutoff
+
+The camera spins in the middle of each map. Passing max_ray_dist overrides
+MAX_RAY_DIST for this run (e.g. 1e9 to see the arena without the cutoff);
+every value is compiled into its own JIT cache folder.
+"""
+import sys
+import numpy as np
+from _common import *
+import settings
+if len(sys.argv) > 2: settings.MAX_RAY_DIST = float(sys.argv[2]) # Before raycaster star-imports settings
+import raycaster
+import occupancy
+
+def make_map(side, kind, seed=4):
+    rng = np.random.default_rng(seed)
+    world_map = (rng.random((side, side)) < (0.25 if kind == "maze" else 0.002)).astype(np.int32)
+    world_map[0, :] = world_map[-1, :] = world_map[:, 0] = world_map[:, -1] = 1
+    world_map[side // 2 - 1:side // 2 + 2, side // 2 - 1:side // 2 + 2] = 0 # Room for the camera
+    return world_map
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    walls, floor, ceil = make_textures()
+    floor_ao, row_shade = raycaster.build_floor_tables()
+    screen_buffer, depth_buffer = make_buffers()
+    rays = raycaster.ray_table(SCREEN_WIDTH)
+    kernel = raycaster.render_kernel
+    raycaster.warmup(kernel)
+
+    print(f"MAX_RAY_DIST = {settings.MAX_RAY_DIST:g} tiles")
+    print(f"{'side':>6} {'maze':>10} {'arena':>10}   map MB")
+    for side in (24, 64, 256, 1024, 4096):
+        medians = []
+        for kind in ("maze", "arena"):
+            world_map = make_map(side, kind)
+            occ = occupancy.build_occupancy(world_map)
+            door_state = np.zeros(world_map.shape, dtype=np.float32)
+            door_lock = np.zeros(world_map.shape, dtype=np.int32)
+            centre = (side // 2 + 0.5) * TILE_SIZE
+            frame = lambda i: kernel(centre, centre, i * 0.05, 0.0, world_map, occ, door_state, door_lock, door_lock, walls, floor, ceil, floor_ao, row_shade, rays, screen_buffer, depth_buffer)
+            medians.append(np.median(time_frames(frame, frames)))
+            del door_state, door_lock
+        print(f"{side:6d} {medians[0]:7.2f} ms {medians[1]:7.2f} ms   {world_map.nbytes / 2**20:6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Door automation per tick: the old dict scans in Game.update_doors vs doors.Doors.
+
+    python benchmarks/bench_doors.py [ticks]
+
+Stress maps are square grids of one-tile rooms with a door (tile 4, every
+tenth one locked: tile 3) in each wall between them, from ~1.2k to ~20k doors.
+The player walks a diagonal through the grid.
+`trickle` presses a few doors every tick, so most doors wait on a timer and few
+slide; `mass` presses every door on the first tick, so all of them slide together.
+Both implementations run side by side, and door_state, door_lock and
+world_map must match after every tick.
+"""
+import sys
+import math
+import time
+import numpy as np
+from _common import *
+import doors
+
+class DictDoors:
+    """The pre-doors.py Game.interact / update_doors, on the same arrays."""
+    def __init__(self, world_map, door_state, door_lock):
+        self.world_map, self.door_state, self.door_lock = world_map, door_state, door_lock
+        self.unlock_timers, self.active_doors, self.open_timers = {}, {}, {}
+
+    def press(self, gx, gy, now):
+        cell = self.world_map[gx, gy]
+        if cell == 3 and self.door_lock[gx, gy] == 0:
+            self.door_lock[gx, gy] = 1; self.world_map[gx, gy] = 6
+            self.unlock_timers[(gx, gy)] = now + 1000
+        elif cell == 4 and self.door_state[gx, gy] < 0.1 and (gx, gy) not in self.unlock_timers:
+            self.world_map[gx, gy] = 6
+            self.unlock_timers[(gx, gy)] = now + 1000
+
+    def update(self, now, player_x, player_y):
+        for k in [k for k, t in self.unlock_timers.items() if now >= t]: self.active_doors[k], _ = 'opening', self.unlock_timers.pop(k)
+        fin = []
+        for k, s in self.active_doors.items():
+            if s == 'opening':
+                self.door_state[k] += 0.03
+                if self.door_state[k] >= 1.0: self.door_state[k], self.active_doors[k], self.open_timers[k] = 1.0, 'open', now + 5000
+            elif s == 'closing':
+                self.door_state[k] -= 0.03
+                if self.door_state[k] <= 0.0:
+                    self.door_state[k] = 0.0
+                    fin.append(k)
+                    if self.door_lock[k[0], k[1]] == 1: self.world_map[k] = 3; self.door_lock[k[0], k[1]] = 0
+                    else: self.world_map[k] = 4
+        for k in fin: del self.active_doors[k]
+        for k in [k for k, t in self.open_timers.items() if now >= t and math.hypot(player_x-(k[0]+0.5)*TILE_SIZE, player_y-(k[1]+0.5)*TILE_SIZE) > TILE_SIZE]: self.active_doors[k], _ = 'closing', self.open_timers.pop(k)
+
+def door_grid(rooms):
+    """A rooms x rooms grid of one-tile rooms, doors in every wall between two rooms."""
+    side = 2 * rooms + 1
+    world_map = np.ones((side, side), dtype=np.int32)
+    world_map[1::2, 1::2] = 0
+    world_map[2:-1:2, 1::2] = world_map[1::2, 2:-1:2] = 4
+    cells = np.argwhere(world_map == 4)
+    locked = cells[::10]; world_map[locked[:, 0], locked[:, 1]] = 3
+    return world_map, cells
+
+def run(ticks, world_map, cells, per_tick):
+    """Returns per-tick ms for (dicts, events) and whether both left identical arrays after every tick."""
+    side = world_map.shape[0]
+    arrays = [(world_map.copy(), np.zeros(world_map.shape, dtype=np.float32), np.zeros(world_map.shape, dtype=np.int32)) for _ in range(2)]
+    old = DictDoors(*arrays[0])
+    wm, ds, dl = arrays[1]
+    def set_tile(x, y, tile): wm[x, y] = tile
+    new = doors.Doors(wm, ds, dl, set_tile)
+    order = np.random.default_rng(5).permutation(len(cells))
+    times, identical, now, pressed = np.empty((2, ticks)), True, 0.0, 0
+    for t in range(ticks):
+        now += TICK_MS
+        p = (t * 0.02) % (side - 2) + 1.5; px = py = p * TILE_SIZE
+        batch = cells[order[pressed:pressed + per_tick]] if per_tick else cells
+        pressed = (pressed + len(batch)) % len(cells) if per_tick else pressed
+        for k, impl in enumerate((old, new)):
+            t0 = time.perf_counter()
+            if per_tick or t == 0:
+                for x, y in batch.tolist(): impl.press(x, y, now)
+            impl.update(now, px, py)
+            times[k, t] = (time.perf_counter() - t0) * 1000
+        identical &= all(np.array_equal(a, b) for a, b in zip(*arrays))
+    return times, identical
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    print(f"{'doors':>6} {'load':>8} {'dicts':>10} {'events':>10} {'speedup':>8} {'identical':>10}")
+    for rooms in (25, 50, 100):
+        world_map, cells = door_grid(rooms)
+        for load, per_tick in (("trickle", 4), ("mass", 0)):
+            times, identical = run(ticks, world_map, cells, per_tick)
+            old, new = times.mean(axis=1)
+            print(f"{len(cells):6d} {load:>8} {old:7.3f} ms {new:7.3f} ms {old / new:7.2f}x {str(identical):>10}")
+
+if __name__ == "__main__":
+    main()
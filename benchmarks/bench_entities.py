@@ -0,0 +1,64 @@
+"""Per-tick enemy + pickup update cost against entity count: list-of-dicts loop vs the entities store.
+
+    python benchmarks/bench_entities.py [ticks]
+"""
+import sys
+import math
+import numpy as np
+from _common import *
+import entities
+import flowfield
+
+def spawn(world_map, count, seed=5):
+    """`count` positions (in tiles) on random open cells of the map."""
+    rng = np.random.default_rng(seed)
+    cells = np.argwhere(world_map == 0)
+    return cells[rng.integers(0, len(cells), count)] + rng.uniform(0.2, 0.8, (count, 2))
+
+# The update loops as they were before the entity store
+def legacy_tick(enemies, pickups, player, world_map):
+    px, py = player['x'], player['y']
+    for p in pickups:
+        if not p['collected'] and math.hypot(px - p['x'], py - p['y']) < 75:
+            if p['type'] == 'health' and player['health'] < MAX_HEALTH: player['health'] = min(MAX_HEALTH, player['health'] + 25); p['collected'] = True
+            elif p['type'] == 'ammo' and player['ammo'] < MAX_AMMO: player['ammo'] = min(MAX_AMMO, player['ammo'] + 20); p['collected'] = True
+            elif p['type'] == 'armor' and player['armor'] < 100: player['armor'] = min(100, player['armor'] + 25); p['collected'] = True
+    for e in enemies:
+        if e['health'] <= 0: continue
+        e['anim_timer'] += 1
+        if e['anim_timer'] > 20: e['anim_timer'], e['frame'] = 0, 1 - e['frame']
+        d = math.hypot(px - e['x'], py - e['y'])
+        if d > 40:
+            nx, ny = (px-e['x'])/d, (py-e['y'])/d
+            if world_map[int((e['x']+nx*ENEMY_STEP)//TILE_SIZE), int(e['y']//TILE_SIZE)] == 0: e['x'] += nx*ENEMY_STEP
+            if world_map[int(e['x']//TILE_SIZE), int((e['y']+ny*ENEMY_STEP)//TILE_SIZE)] == 0: e['y'] += ny*ENEMY_STEP
+        else: player['health'] -= ENEMY_DAMAGE_STEP
+
+def store_tick(enemies, pickups, player, world_map, door_state, field):
+    player['health'], player['ammo'], player['armor'] = pickups.collect(player['x'], player['y'], player['health'], player['ammo'], player['armor'])
+    field.update(world_map, door_state, player['x'], player['y'])
+    player['health'] -= enemies.update(player['x'], player['y'], world_map, door_state, field) * ENEMY_DAMAGE_STEP
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    world_map, door_state = load_level(0)[:2]
+    entities.warmup()
+
+    print(f"{'enemies':>8} {'dicts':>10} {'store':>10} {'speedup':>8}")
+    for count in (10, 100, 1000, 10000):
+        tiles, loot = spawn(world_map, count), spawn(world_map, max(1, count // 4), seed=6)
+        kinds = [entities.PICKUP_TYPES[i % 3] for i in range(len(loot))]
+        dicts = [{'x': x * TILE_SIZE, 'y': y * TILE_SIZE, 'health': ENEMY_HEALTH, 'frame': 0, 'anim_timer': 0} for x, y in tiles]
+        dict_loot = [{'x': x * TILE_SIZE, 'y': y * TILE_SIZE, 'type': t, 'collected': False} for (x, y), t in zip(loot, kinds)]
+        store = entities.Enemies.from_tiles(world_map.shape, tiles)
+        store_loot = entities.Pickups.from_tiles(world_map.shape, [(x, y, t) for (x, y), t in zip(loot, kinds)])
+        player = lambda: {'x': 12.5 * TILE_SIZE, 'y': 12.5 * TILE_SIZE, 'health': 50.0, 'ammo': 10, 'armor': 0}
+        p_dicts, p_store = player(), player()
+
+        t_dicts = time_frames(lambda i: legacy_tick(dicts, dict_loot, p_dicts, world_map), ticks)
+        field = flowfield.FlowField(world_map)
+        t_store = time_frames(lambda i: store_tick(store, store_loot, p_store, world_map, door_state, field), ticks)
+        print(f"{count:8d} {np.median(t_dicts):7.3f} ms {np.median(t_store):7.3f} ms {np.median(t_dicts) / np.median(t_store):7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Floor/ceiling pass alone: per-pixel shading math vs the baked lookup tables.
+
+    python benchmarks/bench_floor.py [frames]
+
+The tables are an accepted approximation: under fastmath the per-pixel loop
+may fuse / reorder shade * AO differently than the baked values, so a few
+pixels per frame land one step apart in one channel.
+"""
+import sys
+import math
+import numpy as np
+from numba import njit
+from _common import *
+import raycaster
+
+@njit(fastmath=True)
+def floor_pass_per_pixel(player_x, player_y, horizon, ray_dir_x0, ray_dir_y0, ray_dir_x1, ray_dir_y1, floor_texture, ceil_texture, screen_buffer):
+    # The floor loop as it was before the lookup tables, kept here as the baseline
+    for y in range(0, SCREEN_HEIGHT):
+        p_y = y - horizon
+        if p_y == 0: continue
+        is_floor = p_y > 0
+        row_dist = (0.5 * SCREEN_HEIGHT) / abs(p_y)
+        step_x = row_dist * (ray_dir_x1 - ray_dir_x0) / SCREEN_WIDTH
+        step_y = row_dist * (ray_dir_y1 - ray_dir_y0) / SCREEN_WIDTH
+        floor_x = player_x/TILE_SIZE + row_dist * ray_dir_x0
+        floor_y = player_y/TILE_SIZE + row_dist * ray_dir_y0
+        for x in range(SCREEN_WIDTH):
+            tx = int(floor_x * TEXTURE_SIZE) & (TEXTURE_SIZE - 1)
+            ty = int(floor_y * TEXTURE_SIZE) & (TEXTURE_SIZE - 1)
+            shade = min(0.85, 1.0 / (1.0 + row_dist * 0.15))
+            dist_x = abs(tx - HALF_TEX) / HALF_TEX
+            dist_y = abs(ty - HALF_TEX) / HALF_TEX
+            ao_mult = max(0.1, 1.0 - (max(dist_x, dist_y) ** 4) * 0.8)
+            final_shade = shade * ao_mult
+            c = floor_texture[tx, ty] if is_floor else ceil_texture[tx, ty]
+            screen_buffer[x, y, 0] = int(c[0] * final_shade)
+            screen_buffer[x, y, 1] = int(c[1] * final_shade)
+            screen_buffer[x, y, 2] = int(c[2] * final_shade)
+            floor_x += step_x; floor_y += step_y
+
+def camera(i):
+    x, y, a, p = POSES[i % len(POSES)]
+    a += i * 0.01
+    cos_dir, sin_dir, plane = math.cos(a), math.sin(a), 0.66
+    return (x, y, int(HALF_HEIGHT + p), cos_dir + sin_dir * plane, sin_dir - cos_dir * plane, cos_dir - sin_dir * plane, sin_dir + cos_dir * plane)
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    _, floor, ceil = make_textures()
+    floor_ao, row_shade = raycaster.build_floor_tables()
+    before, _ = make_buffers()
+    after, _ = make_buffers()
+
+    old = lambda i: floor_pass_per_pixel(*camera(i), floor, ceil, before)
+    new = lambda i: raycaster.floor_pass(*camera(i), floor, ceil, floor_ao, row_shade, after)
+    old(0); new(0)  # JIT warmup
+
+    t_old, t_new = time_frames(old, frames), time_frames(new, frames)
+    diff = changed = 0
+    for i in range(frames):
+        old(i); new(i)
+        delta = np.abs(before.astype(np.int32) - after).max(axis=2)
+        diff, changed = max(diff, delta.max()), changed + np.count_nonzero(delta)
+    print(f"per-pixel shading : {np.median(t_old):6.2f} ms")
+    print(f"lookup tables     : {np.median(t_new):6.2f} ms  ({np.median(t_old) / np.median(t_new):.2f}x)")
+    print(f"max channel difference over all frames: {diff} ({changed / frames:.1f} of {SCREEN_WIDTH * SCREEN_HEIGHT} pixels per frame)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Flow field cost and payoff.
+
+    python benchmarks/bench_flowfield.py [ticks]
+
+1. Rebuild time of the BFS field for every level and for large random mazes
+   (paid only when the player changes tile or a door flips), capped at
+   FLOW_FIELD_RADIUS steps and uncapped, plus the field's memory.
+2. Enemy tick time with the field against enemy count (should grow with the
+   enemies only, not with the field).
+3. How many enemies scattered over LEVEL_1 reach the player within `ticks`
+   when steering straight at them vs following the field.
+"""
+import sys
+import numpy as np
+from _common import *
+import entities
+import flowfield
+
+def random_maze(side, seed=11):
+    rng = np.random.default_rng(seed)
+    world_map = (rng.random((side, side)) < 0.25).astype(np.int32)
+    world_map[0, :] = world_map[-1, :] = world_map[:, 0] = world_map[:, -1] = 1
+    return world_map
+
+def spawn(world_map, count, seed=5):
+    rng = np.random.default_rng(seed)
+    cells = np.argwhere(world_map == 0)
+    return cells[rng.integers(0, len(cells), count)] + 0.5
+
+def reached(world_map, door_state, tiles, player, field, ticks):
+    e = entities.Enemies.from_tiles(world_map.shape, tiles)
+    for _ in range(ticks): e.update(*player, world_map, door_state, field)
+    return int(np.sum(np.hypot(e.x - player[0], e.y - player[1]) < 1.5 * TILE_SIZE))
+
+def build_once(field, world_map, door_state, cell):
+    field.build(world_map, door_state, int(cell[0]), int(cell[1]))
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 6000
+    entities.warmup()
+
+    print(f"{'map':>10} {'tiles':>8} {'rebuild':>10} {'uncapped':>10} {'field MB':>9}")
+    for name, (world_map, door_state) in [(f"LEVEL_{i + 1}", load_level(i)[:2]) for i in range(len(levels.LEVELS))] + [(f"maze {s}^2", (random_maze(s), np.zeros((s, s), dtype=np.float32))) for s in (64, 256, 1024)]:
+        open_cells = np.argwhere(world_map == 0)
+        times = []
+        for radius in (FLOW_FIELD_RADIUS, 32766):
+            field = flowfield.FlowField(world_map, radius)
+            times.append(np.median(time_frames(lambda i: build_once(field, world_map, door_state, open_cells[i % len(open_cells)]), 50)))
+        field = flowfield.FlowField(world_map)
+        size_mb = (field.dist.nbytes + field.flow.nbytes + field.queue.nbytes) / 2**20
+        print(f"{name:>10} {world_map.size:8d} {times[0]:7.3f} ms {times[1]:7.3f} ms {size_mb:9.2f}")
+
+    world_map, door_state = load_level(0)[:2]
+    player = (12.5 * TILE_SIZE, 12.5 * TILE_SIZE)
+    field = flowfield.FlowField(world_map)
+    field.update(world_map, door_state, *player)
+    print(f"\n{'enemies':>8} {'tick':>10}")
+    for count in (10, 100, 1000, 10000):
+        e = entities.Enemies.from_tiles(world_map.shape, spawn(world_map, count))
+        t = time_frames(lambda i: e.update(*player, world_map, door_state, field), 200)
+        print(f"{count:8d} {np.median(t):7.3f} ms")
+
+    tiles = spawn(world_map, 200)
+    straight = flowfield.FlowField(world_map) # Never built: every tile reads as off the field, so enemies steer straight
+    print(f"\nenemies within 1.5 tiles of the player after {ticks} ticks (of {len(tiles)}):")
+    print(f"  straight: {reached(world_map, door_state, tiles, player, straight, ticks)}")
+    print(f"  flow:     {reached(world_map, door_state, tiles, player, field, ticks)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""HUD cost per frame: the old immediate-mode HUD vs the retained status bar and text cache.
+
+    python benchmarks/bench_hud.py [frames]
+
+Both draw the status bar, compass letter, FPS counter and door prompt onto
+the screen. `steady` keeps every value fixed (the usual frame), `changing`
+alters ammo and health every frame (the retained bar's worst case).
+"""
+import os
+import sys
+import contextlib
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+from _common import *
+
+def immediate_hud(game):
+    """The pre-retained draw_hud text and status bar: everything rendered and drawn from scratch."""
+    screen = game.screen
+    screen.blit(game.assets.images['hud_bg'], (0, SCREEN_HEIGHT-HUD_HEIGHT))
+    pygame.draw.line(screen, DOOM_BEVEL_LIGHT, (0, SCREEN_HEIGHT-HUD_HEIGHT), (SCREEN_WIDTH, SCREEN_HEIGHT-HUD_HEIGHT), 3)
+    def db(x, l, v, p=False):
+        r = pygame.Rect(x, SCREEN_HEIGHT-HUD_HEIGHT+15, 100, HUD_HEIGHT-30)
+        pygame.draw.rect(screen, DOOM_BEVEL_DARK, r); pygame.draw.rect(screen, DOOM_BEVEL_LIGHT, r, 2)
+        ls = game.custom_ui_font_small.render(l, True, DOOM_GOLD); screen.blit(ls, (r.x+(r.w-ls.get_width())//2, r.y+4))
+        vs = game.custom_ui_font.render(f"{int(v)}{'%' if p else ''}", True, DOOM_RED); screen.blit(vs, (r.x+(r.w-vs.get_width())//2, r.y+18))
+    db(20, "AMMO", game.ammo); db(140, "HEALTH", game.health, True); db(SCREEN_WIDTH-260, "ARMOR", game.armor, True)
+    fr = pygame.Rect(SCREEN_WIDTH//2-40, SCREEN_HEIGHT-HUD_HEIGHT+10, 80, 80); pygame.draw.rect(screen, (0,0,0), fr)
+    screen.blit(game.assets.faces[game.face_state], (fr.x+8, fr.y+8)); pygame.draw.rect(screen, DOOM_BEVEL_LIGHT, fr, 3)
+    itxt = game.custom_ui_font_small.render("Press E to Open", True, (255, 255, 255)); screen.blit(itxt, (SCREEN_WIDTH//2 - itxt.get_width()//2, HALF_HEIGHT + 60))
+    fps = game.custom_ui_font_small.render(f"FPS: {int(game.clock.get_fps())}", True, (0, 255, 0)); screen.blit(fps, (SCREEN_WIDTH - 100, 20))
+    cs = game.compass_font.render(game.get_compass_direction(), True, (245, 245, 220)); screen.blit(cs, (25, 25))
+
+def retained_hud(game):
+    """The same output through StatusBar and TextCache, as Game.draw_hud does it now."""
+    screen, text = game.screen, game.text_cache
+    game.status_bar.update(game.ammo, game.health, game.armor, game.face_state); game.status_bar.draw(screen)
+    pygame.draw.line(screen, DOOM_BEVEL_LIGHT, (0, SCREEN_HEIGHT-HUD_HEIGHT), (SCREEN_WIDTH, SCREEN_HEIGHT-HUD_HEIGHT), 3)
+    itxt = text.render(game.custom_ui_font_small, "Press E to Open", (255, 255, 255)); screen.blit(itxt, (SCREEN_WIDTH//2 - itxt.get_width()//2, HALF_HEIGHT + 60))
+    fps = text.render(game.custom_ui_font_small, f"FPS: {int(game.clock.get_fps())}", (0, 255, 0)); screen.blit(fps, (SCREEN_WIDTH - 100, 20))
+    cs = text.render(game.compass_font, game.get_compass_direction(), (245, 245, 220)); screen.blit(cs, (25, 25))
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    import main as game_main
+    with contextlib.redirect_stdout(sys.stderr): game = game_main.Game()
+    game.reset_game_data(level=0)
+
+    def steady(draw):
+        def frame(i): game.player_angle = i * 0.01; draw(game)
+        return frame
+    def changing(draw):
+        def frame(i): game.player_angle, game.ammo, game.health = i * 0.01, i % MAX_AMMO, 1 + i % MAX_HEALTH; draw(game)
+        return frame
+
+    print(f"{'values':>9} {'immediate':>12} {'retained':>12}")
+    for name, scenario in (("steady", steady), ("changing", changing)):
+        t_old, t_new = time_frames(scenario(immediate_hud), frames), time_frames(scenario(retained_hud), frames)
+        print(f"{name:>9} {1000 * np.median(t_old):9.1f} us {1000 * np.median(t_new):9.1f} us")
+    print(f"text cache: {game.text_cache.hits} hits, {game.text_cache.misses} misses")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Level load time: the old per-character MAP_STRING parse vs the compiled .hgl file.
+
+    python benchmarks/bench_levels.py [loads]
+
+For LEVEL_1 and synthetic square maps: the per-character parse Game.init_map
+used to do, converting the dict into a .hgl file, a cold read (open + map the
+file), and a cached levelfile.load plus the writable world_map copy the game
+takes on every reset.
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+from _common import *
+import levelfile
+
+def parse(lvl):
+    """The pre-levelfile Game.init_map loop."""
+    sx, sy = lvl['MAP_SIZE_X'], lvl['MAP_SIZE_Y']
+    world_map = np.zeros((sx, sy), dtype=np.int32)
+    for j, char in enumerate(lvl['MAP_STRING']):
+        world_map[j % sx, j // sx] = int(char)
+    return world_map
+
+def synthetic(side, seed=3):
+    rng = np.random.default_rng(seed)
+    tiles = np.where(rng.random((side, side)) < 0.2, rng.integers(1, 5, (side, side)), 0)
+    tiles[0, :] = tiles[-1, :] = tiles[:, 0] = tiles[:, -1] = 1
+    cells = np.argwhere(tiles == 0) + 0.5
+    return {'MAP_SIZE_X': side, 'MAP_SIZE_Y': side, 'MAP_STRING': ''.join(map(str, tiles.T.ravel())),
+            'SPAWN_LOCATIONS': [tuple(c) for c in cells[:side]], 'PICKUP_LOCATIONS': [(*c, 'ammo') for c in cells[side:2 * side]]}
+
+def main():
+    loads = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    cases = [("LEVEL_1", levels.LEVELS[0])] + [(f"{s}^2", synthetic(s)) for s in (24, 256, 1024)]
+    print(f"{'map':>8} {'file':>10} {'parse':>10} {'convert':>10} {'cold read':>10} {'load+copy':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, lvl in cases:
+            path = os.path.join(tmp, f"{name.replace('^', '_')}.hgl")
+            runs = max(1, loads // 10) if lvl['MAP_SIZE_X'] >= 1024 else loads # The per-char parse takes seconds at 1024^2
+            t_parse = time_frames(lambda i: parse(lvl), runs)
+            t_convert = time_frames(lambda i: levelfile.write(levelfile.from_dict(lvl), path), loads)
+            t_read = time_frames(lambda i: levelfile.read(path), loads)
+            cached = levelfile.read(path)
+            t_load = time_frames(lambda i: cached.tiles.astype(np.int32), loads)
+            assert np.array_equal(parse(lvl), cached.tiles)
+            print(f"{name:>8} {os.path.getsize(path) // 1024:7d} KB {np.median(t_parse):7.2f} ms {np.median(t_convert):7.2f} ms {np.median(t_read):7.3f} ms {np.median(t_load):7.3f} ms")
+
+if __name__ == "__main__":
+    main()
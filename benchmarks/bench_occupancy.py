@@ -0,0 +1,53 @@
+"""Wall pass on large open maps: plain per-tile DDA vs skipping empty occupancy blocks.
+
+    python benchmarks/bench_occupancy.py [frames] [max_ray_dist]
+
+Open arenas (border walls plus a sprinkle of pillars) from 256^2 to 4096^2,
+camera drifting around the middle. `plain` is the kernel with every block
+marked occupied (OCCUPANCY_GRID = False), `blocks` the real grid. Every frame
+of both runs is compared: pixels and depth buffer must match exactly.
+With the default MAX_RAY_DIST rays give up after 64 tiles, which already keeps
+the plain walk short; pass e.g. 1e9 to see rays cross the whole arena.
+"""
+import sys
+import numpy as np
+from _common import *
+import settings
+if len(sys.argv) > 2: settings.MAX_RAY_DIST = float(sys.argv[2]) # Before raycaster star-imports settings
+import raycaster
+import occupancy
+
+def arena(side, pillars, seed=6):
+    rng = np.random.default_rng(seed)
+    world_map = (rng.random((side, side)) < pillars).astype(np.int32)
+    world_map[0, :] = world_map[-1, :] = world_map[:, 0] = world_map[:, -1] = 1
+    return world_map
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    walls = make_textures()[0]
+    screen_buffer, depth_buffer = make_buffers()
+    rays = raycaster.ray_table(SCREEN_WIDTH)
+    ref_buffer, ref_depth = make_buffers()
+
+    print(f"MAX_RAY_DIST = {settings.MAX_RAY_DIST:g} tiles")
+    print(f"{'side':>6} {'pillars':>8} {'plain':>10} {'blocks':>10} {'speedup':>8} {'identical':>10}")
+    for side in (256, 1024, 4096):
+        for pillars in (0.0, 0.001, 0.01):
+            world_map = arena(side, pillars)
+            door_state = np.zeros(world_map.shape, dtype=np.float32)
+            grids = occupancy.build_occupancy(world_map, enabled=False), occupancy.build_occupancy(world_map, enabled=True)
+            centre = (side // 2 + 0.5) * TILE_SIZE
+            def frame(occ, screen, zbuf):
+                return lambda i: raycaster.wall_pass(centre + (i * 37) % 300, centre - (i * 53) % 300, i * 0.05, HALF_HEIGHT, world_map, occ, door_state, walls, rays, screen, zbuf)
+            plain, blocks = frame(grids[0], ref_buffer, ref_depth), frame(grids[1], screen_buffer, depth_buffer)
+            plain(0); blocks(0) # JIT warmup
+            t_plain, t_blocks = time_frames(plain, frames), time_frames(blocks, frames)
+            identical = True
+            for i in range(frames):
+                plain(i); blocks(i)
+                identical &= np.array_equal(ref_buffer, screen_buffer) and np.array_equal(ref_depth, depth_buffer)
+            print(f"{side:6d} {pillars:8.3f} {np.median(t_plain):7.3f} ms {np.median(t_blocks):7.3f} ms {np.median(t_plain) / np.median(t_blocks):7.2f}x {str(identical):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Full-screen overlays per frame: a fresh Surface every frame vs the preallocated effects Surfaces.
+
+    python benchmarks/bench_overlays.py [frames]
+
+`tint` is the pause / game-over / damage-flash overlay (fill + set_alpha +
+blit), `fade` the loading screen (copy of the image + set_alpha + blit).
+"""
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+from _common import *
+import effects
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert(); image.fill((90, 30, 30))
+    overlays, fade = effects.Overlays(), effects.Fade(image)
+
+    def fresh_tint(i):
+        ov = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); ov.fill((0, 0, 0)); ov.set_alpha(i % 256); screen.blit(ov, (0, 0))
+    def fresh_fade(i):
+        img = image.copy(); img.set_alpha(i % 256); screen.blit(img, (0, 0))
+
+    print(f"{'overlay':>8} {'per frame':>12} {'preallocated':>13}")
+    for name, old, new in (("tint", fresh_tint, lambda i: overlays.tint(screen, (0, 0, 0), i % 256)),
+                           ("fade", fresh_fade, lambda i: fade.draw(screen, i % 256))):
+        t_old, t_new = time_frames(old, frames), time_frames(new, frames)
+        print(f"{name:>8} {1000 * np.median(t_old):9.1f} us {1000 * np.median(t_new):10.1f} us")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Frames per second of the whole gameplay loop (tick + draw + flip): serial vs pipelined render.
+
+    python benchmarks/bench_pipeline.py [frames]
+
+Each mode runs LEVEL_1 with the camera turning in place and enemies chasing,
+with the serial and the parallel kernel. The pipelined loop can only win
+when there are spare cores for the render worker (check `cores` below).
+"""
+import os
+import sys
+import time
+import contextlib
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+from _common import *
+import raycaster
+import postfx
+
+def run(game, frames):
+    game.reset_game_data(level=0); game.state = "game"
+    times = np.empty(frames)
+    for i in range(-10, frames):
+        t0 = time.perf_counter()
+        game.player_angle = 0.01 * i
+        game.tick(); game.interpolate(1.0)
+        game.draw()
+        if i >= 0: times[i] = time.perf_counter() - t0
+    if game.pipeline: game.pipeline.drain()
+    return 1.0 / np.median(times), 1.0 / np.mean(times)
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    import main as game_main
+    with contextlib.redirect_stdout(sys.stderr):
+        serial_game, piped_game = game_main.Game(pipelined=False), game_main.Game(pipelined=True)
+    for g in (serial_game, piped_game): g.warmup_thread.join()
+
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'kernel':>9} {'loop':>10} {'fps (p50)':>10} {'fps (mean)':>11}")
+    for parallel in (False, True):
+        for game in (serial_game, piped_game):
+            game.render_kernel = raycaster.select_kernel(parallel=parallel)
+            game.postfx_kernel = postfx.select_kernel(parallel=parallel)
+            raycaster.warmup(game.render_kernel)
+            p50, mean = run(game, frames)
+            print(f"{'parallel' if parallel else 'serial':>9} {'pipelined' if game.pipeline else 'serial':>10} {p50:10.1f} {mean:11.1f}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Post-processing cost: one fused jitted pass vs a pass (or an SDL blit) per effect.
+
+    python benchmarks/bench_postfx.py [frames]
+
+Effect stacks grow from the damage flash alone up to grade + vignette +
+flash + retro. `blit` is the old way of drawing the flash (a preallocated
+full-screen Surface alpha-blitted over the frame); it only exists for the tint.
+`separate` runs the kernel once per effect row, `fused` once for the whole stack.
+"""
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+from _common import *
+import raycaster
+import postfx
+import effects
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pixels, screen_buffer = raycaster.make_frame_buffer()
+    pixels[:] = np.random.default_rng(2).integers(0, 256, pixels.shape, dtype=np.uint8)
+    frame_surface = pygame.image.frombuffer(pixels, (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGBX')
+    overlays = effects.Overlays()
+
+    stacks = []
+    fx = postfx.EffectStack(); fx.tint((255, 0, 0), 0.4); stacks.append(("flash", fx))
+    fx = postfx.EffectStack(); fx.grade(1.1, 1.4); fx.tint((255, 0, 0), 0.4); stacks.append(("+grade", fx))
+    fx = postfx.EffectStack(); fx.grade(1.1, 1.4); fx.vignette(0.6, 0.3); fx.tint((255, 0, 0), 0.4); stacks.append(("+vignette", fx))
+    fx = postfx.EffectStack(); fx.grade(1.1, 1.4); fx.vignette(0.6, 0.3); fx.tint((255, 0, 0), 0.4); fx.retro(6); stacks.append(("+retro", fx))
+
+    blit = lambda i: (screen.blit(frame_surface, (0, 0)), overlays.tint(screen, (255, 0, 0), 102))
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'effects':>10} {'blit':>10} {'separate':>10} {'fused':>10} {'fused par':>10}")
+    for name, fx in stacks:
+        rows = fx.active()
+        separate = lambda i: [postfx.post_process(screen_buffer, rows[k:k + 1]) for k in range(len(rows))]
+        fused = lambda i: postfx.post_process(screen_buffer, rows)
+        fused_par = lambda i: postfx.post_process_parallel(screen_buffer, rows)
+        separate(0); fused(0); fused_par(0) # JIT warmup
+        t_blit = f"{np.median(time_frames(blit, frames)):7.3f} ms" if name == "flash" else f"{'-':>10}"
+        print(f"{name:>10} {t_blit} {np.median(time_frames(separate, frames)):7.3f} ms {np.median(time_frames(fused, frames)):7.3f} ms {np.median(time_frames(fused_par, frames)):7.3f} ms")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Level transition latency (Game.reset_game_data) with and without background prefetch.
+
+    python benchmarks/bench_prefetch.py [transitions]
+
+LEVEL_1 plus synthetic square levels appended to levels.LEVELS (compiled into
+a temporary maps directory). `miss` builds the level on the main thread,
+`hit` swaps in the level the prefetcher staged beforehand. The last column is
+the median gameplay frame (tick + draw) while the worker is staging the level,
+against the frame with nothing staging in brackets, i.e. what prefetching costs
+the level being played.
+"""
+import os
+import sys
+import time
+import tempfile
+import contextlib
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+from _common import *
+import levelfile
+from bench_levels import synthetic
+
+def frame(game):
+    game.tick(); game.interpolate(1.0); game.draw()
+
+def main():
+    transitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    levelfile.LEVEL_DIR = tempfile.mkdtemp()
+    sizes = (256, 1024)
+    levels.LEVELS.extend(synthetic(s) for s in sizes)
+    for i in range(len(levels.LEVELS)): levelfile.load(i) # Convert up front: the game ships compiled levels
+    import main as game_main
+    with contextlib.redirect_stdout(sys.stderr): game = game_main.Game()
+    game.warmup_thread.join()
+    prefetcher = game.prefetcher
+
+    print(f"{'map':>8} {'miss':>10} {'hit':>10} {'frame while staging':>22}")
+    with open(os.devnull, "w") as null, contextlib.redirect_stderr(null):
+        for index, name in [(0, "LEVEL_1")] + [(len(levels.LEVELS) - len(sizes) + k, f"{s}^2") for k, s in enumerate(sizes)]:
+            miss, hit = [], []
+            for _ in range(transitions):
+                prefetcher.index = None # Forget anything staged, so take() misses
+                game.reset_game_data(level=index); miss.append(game.transition_ms)
+                prefetcher.request(index); prefetcher.thread.join()
+                game.reset_game_data(level=index); hit.append(game.transition_ms)
+
+            game.reset_game_data(level=0); game.state = "game"
+            idle = time_frames(lambda i: frame(game), 30)
+            staging = []
+            for _ in range(3):
+                prefetcher.request(index)
+                while prefetcher.thread.is_alive():
+                    t0 = time.perf_counter(); frame(game); staging.append((time.perf_counter() - t0) * 1000.0)
+                prefetcher.take(index)
+            print(f"{name:>8} {np.median(miss):7.2f} ms {np.median(hit):7.2f} ms {np.median(staging) if staging else 0:9.2f} ms ({np.median(idle):.2f} ms)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Cost of the present step: int32 array -> make_surface -> blit vs blitting the persistent frame Surface.
+
+    python benchmarks/bench_present.py [frames]
+"""
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame
+from _common import *
+import raycaster
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = np.random.default_rng(0)
+
+    # Before: int32 frame converted into a brand new Surface every frame
+    old_buffer = rng.integers(0, 256, (SCREEN_WIDTH, SCREEN_HEIGHT, 3)).astype(np.int32)
+    old = lambda i: screen.blit(pygame.surfarray.make_surface(old_buffer), (0, 0))
+
+    # After: the kernel's uint8 view already is the Surface's pixel memory
+    frame_pixels, screen_buffer = raycaster.make_frame_buffer()
+    screen_buffer[:] = old_buffer
+    frame_surface = pygame.image.frombuffer(frame_pixels, (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGBX')
+    new = lambda i: screen.blit(frame_surface, (0, 0))
+
+    old(0); new(0)
+    assert pygame.surfarray.array3d(screen).tolist() == old_buffer.tolist(), "both paths must present the same image"
+    t_old, t_new = time_frames(old, frames), time_frames(new, frames)
+    print(f"make_surface + blit : {np.median(t_old):6.3f} ms/frame, frame buffer {old_buffer.nbytes / 2**20:.2f} MB + {SCREEN_WIDTH * SCREEN_HEIGHT * 4 / 2**20:.2f} MB new Surface every frame")
+    print(f"persistent Surface  : {np.median(t_new):6.3f} ms/frame, frame buffer {frame_pixels.nbytes / 2**20:.2f} MB, nothing allocated per frame ({np.median(t_old) / np.median(t_new):.1f}x)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Proximity and hitscan query cost as the map and entity count grow: full scans vs the spatial grid.
+
+    python benchmarks/bench_spatial.py [queries]
+
+Entities sit on an open square map at one per four tiles; every query starts
+from a random spot, so the full scan grows with the entity count while the
+grid only walks the tiles around the query.
+"""
+import sys
+import numpy as np
+from _common import *
+import entities
+
+def scan_near(e, px, py, radius):
+    return np.flatnonzero(e.alive() & (np.hypot(e.x - px, e.y - py) < radius))
+
+def scan_along(e, ox, oy, angle, half_width):
+    pc, ps = np.cos(angle), np.sin(angle)
+    dx, dy = e.x - ox, e.y - oy
+    along = dx * pc + dy * ps
+    hits = np.flatnonzero(e.alive() & (along > 0) & (np.abs(dy * pc - dx * ps) < half_width))
+    return hits[np.argmin(along[hits])] if len(hits) else -1
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    entities.warmup()
+    rng = np.random.default_rng(7)
+
+    print(f"{'map':>6} {'enemies':>8} {'scan near':>10} {'grid near':>10} {'scan ray':>10} {'grid ray':>10}")
+    for side in (32, 128, 512, 1024):
+        count = side * side // 4
+        world_map = np.zeros((side, side), dtype=np.int32)
+        e = entities.Enemies.from_tiles(world_map.shape, rng.uniform(0, side, (count, 2)))
+        spots = rng.uniform(0, side * TILE_SIZE, (queries, 3))
+
+        t_scan_near = time_frames(lambda i: scan_near(e, spots[i, 0], spots[i, 1], 75.0), queries)
+        t_grid_near = time_frames(lambda i: e.grid.near(spots[i, 0], spots[i, 1], 75.0), queries)
+        t_scan_ray = time_frames(lambda i: scan_along(e, spots[i, 0], spots[i, 1], spots[i, 2], 30.0), queries)
+        t_grid_ray = time_frames(lambda i: e.grid.along(spots[i, 0], spots[i, 1], spots[i, 2], 30.0), queries)
+        agree = all(scan_along(e, *spots[i], 30.0) == e.grid.along(*spots[i], 30.0) for i in range(min(queries, 100)))
+        print(f"{side:4d}^2 {count:8d} {1000 * np.median(t_scan_near):7.1f} us {1000 * np.median(t_grid_near):7.1f} us "
+              f"{1000 * np.median(t_scan_ray):7.1f} us {1000 * np.median(t_grid_ray):7.1f} us{'' if agree else '  (ray results differ!)'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Sprite stage cost against sprite count: legacy pygame.transform path (uncached and with the
+scaled-sprite cache) vs the jitted sprite pass.
+
+    python benchmarks/bench_sprites.py [frames]
+"""
+import os
+import sys
+import contextlib
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import pygame
+from _common import *
+import raycaster
+import entities
+from assets import SpriteCache
+
+def populate(game, count, seed=3):
+    """`count` enemies and pickups scattered down LEVEL_1's long east-west corridor (row 10)."""
+    rng = np.random.default_rng(seed)
+    picks = np.column_stack([rng.uniform(4.0, 22.5, count), rng.uniform(10.2, 10.8, count)])
+    game.enemies = entities.Enemies.from_tiles(game.world_map.shape, picks[: count // 2])
+    game.enemies.frame[:] = np.arange(len(game.enemies)) % 2
+    game.pickups = entities.Pickups.from_tiles(game.world_map.shape, [(x, y, entities.PICKUP_TYPES[i % 3]) for i, (x, y) in enumerate(picks[count // 2:])])
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    import main as game_main
+    with contextlib.redirect_stdout(sys.stderr): game = game_main.Game()
+    game.warmup_thread.join()
+    game.reset_game_data(level=0); game.state = "game"
+    game.player_x, game.player_y, game.player_angle = 1.5 * TILE_SIZE, 10.5 * TILE_SIZE, 0.0 # Looking down the corridor
+
+    cache = game.assets.sprite_cache
+    print(f"{'sprites':>8} {'uncached':>10} {'cached':>10} {'kernel':>10} {'hit rate':>9}")
+    for count in (10, 50, 100, 500, 1000):
+        populate(game, count); game.interpolate(1.0)
+        rw, rh = game.render_world()
+
+        legacy = lambda i: game.draw_sprites(rw, 0, 0)
+        kernel = lambda i: game.render_sprites(rw, rh)
+        game.assets.sprite_cache = SpriteCache(budget=0) # Every sprite rescaled every frame
+        legacy(0); t_uncached = time_frames(legacy, frames)
+        game.assets.sprite_cache = cache; cache.hits = cache.misses = 0
+        legacy(0); t_cached = time_frames(legacy, frames)
+        kernel(0); t_kernel = time_frames(kernel, frames)
+        hit_rate = cache.hits / max(1, cache.hits + cache.misses)
+        print(f"{count:8d} {np.median(t_uncached):7.3f} ms {np.median(t_cached):7.3f} ms {np.median(t_kernel):7.3f} ms {hit_rate:8.1%}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Cold vs warm time-to-first-frame of the render kernel.
+
+    python benchmarks/bench_startup.py [runs]
+
+Each run is a fresh interpreter. "cold" starts from an empty JIT cache folder,
+"warm" reuses the folder the cold run filled.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import time; t0 = time.perf_counter()
+import sys; sys.path.insert(0, {root!r})
+import raycaster
+kernel = raycaster.select_kernel()
+raycaster.warmup(kernel)
+print(time.perf_counter() - t0)
+"""
+
+def first_frame(cache_dir):
+    env = dict(os.environ, HELLSGRID_JIT_CACHE=cache_dir)
+    out = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT)], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    cold, warm = [], []
+    for _ in range(runs):
+        cache_dir = tempfile.mkdtemp(prefix="hellsgrid_jit_")
+        try:
+            cold.append(first_frame(cache_dir))
+            warm.append(first_frame(cache_dir))
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    print(f"cold time-to-first-frame: {min(cold):6.2f} s (best of {runs})")
+    print(f"warm time-to-first-frame: {min(warm):6.2f} s (best of {runs})")
+
+if __name__ == "__main__":
+    main()
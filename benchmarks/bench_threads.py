@@ -0,0 +1,52 @@
+"""Frame time of the render kernel against core count.
+
+    python benchmarks/bench_threads.py [frames]
+
+Also checks that every parallel run produces the exact pixels of the serial
+kernel, at full size and at every dynamic resolution step.
+"""
+import sys
+import numba
+import numpy as np
+from _common import *
+import raycaster
+import occupancy
+import resolution
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    world_map, door_state, door_lock, door_dir = load_level(0)
+    occ = occupancy.build_occupancy(world_map)
+    walls, floor, ceil = make_textures()
+    floor_ao, row_shade = raycaster.build_floor_tables()
+    ref_buf, ref_depth = make_buffers()
+    buf, depth = make_buffers()
+
+    scaler = resolution.DynamicResolution()
+    sizes = []
+    for k in range(int(round((1.0 - DYNAMIC_RES_MIN_SCALE) / DYNAMIC_RES_STEP)) + 1):
+        scaler.scale = 1.0 - k * DYNAMIC_RES_STEP; sizes.append(scaler.size)
+
+    def run(kernel, screen, zbuf, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        rw, rh = size
+        def frame(i):
+            x, y, a, p = POSES[i % len(POSES)]
+            kernel(x, y, a + i * 0.01, p, world_map, occ, door_state, door_lock, door_dir, walls, floor, ceil, floor_ao, row_shade, raycaster.ray_table(rw), screen[:rw, :rh], zbuf)
+        return frame
+
+    run(raycaster.render_kernel, ref_buf, ref_depth)(0); run(raycaster.render_kernel_parallel, buf, depth)(0)  # JIT warmup
+    serial = time_frames(run(raycaster.render_kernel, ref_buf, ref_depth), frames)
+    print(f"serial      : {np.median(serial):7.2f} ms/frame")
+
+    for threads in range(1, numba.config.NUMBA_NUM_THREADS + 1):
+        numba.set_num_threads(threads)
+        times = time_frames(run(raycaster.render_kernel_parallel, buf, depth), frames)
+        for size in sizes:
+            for i in range(len(POSES)):
+                run(raycaster.render_kernel, ref_buf, ref_depth, size)(i); run(raycaster.render_kernel_parallel, buf, depth, size)(i)
+                if not (np.array_equal(ref_buf, buf) and np.array_equal(ref_depth, depth)):
+                    print(f"MISMATCH against the serial kernel at pose {i}, {size[0]}x{size[1]}, with {threads} threads"); sys.exit(1)
+        print(f"{threads:2d} thread(s): {np.median(times):7.2f} ms/frame  ({np.median(serial) / np.median(times):.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Wall pass alone against texture size and atlas layout.
+
+    python benchmarks/bench_walls.py [frames]
+
+layouts:
+  int32 columns  - the old int32 (n, x, y, 3) store
+  uint8 columns  - the TextureAtlas layout, each texture column contiguous
+  uint8 rows     - same bytes stored row-major, so every texel down a column is a cache miss
+"""
+import sys
+import math
+import numpy as np
+from _common import *
+import raycaster
+import occupancy
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    world_map, door_state, _, _ = load_level(0)
+    occ = occupancy.build_occupancy(world_map)
+    screen_buffer, depth_buffer = make_buffers()
+    rays = raycaster.ray_table(SCREEN_WIDTH)
+
+    print(f"{'size':>5} {'int32 columns':>14} {'uint8 columns':>14} {'uint8 rows':>12}   atlas MB (int32 -> uint8)")
+    for size in (128, 256, 512):
+        walls = make_textures(size)[0]
+        layouts = [walls.astype(np.int32), walls, np.ascontiguousarray(walls.transpose(0, 2, 1, 3)).transpose(0, 2, 1, 3)]
+        medians = []
+        for atlas in layouts:
+            def frame(i):
+                x, y, a, p = POSES[i % len(POSES)]
+                raycaster.wall_pass(x, y, a + i * 0.01, int(HALF_HEIGHT + p), world_map, occ, door_state, atlas, rays, screen_buffer, depth_buffer)
+            frame(0)  # JIT warmup for this array type
+            medians.append(np.median(time_frames(frame, frames)))
+        print(f"{size:5d} {medians[0]:11.3f} ms {medians[1]:11.3f} ms {medians[2]:9.3f} ms   {layouts[0].nbytes / 2**20:6.1f} -> {walls.nbytes / 2**20:5.1f}")
+
+if __name__ == "__main__":
+    main()
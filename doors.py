@@ -0,0 +1,92 @@
+import heapq
+import math
+import numpy as np
+from settings import *
+
+# --- DOOR EVENTS ---
+# A door only needs attention when one of its deadlines passes (the switch was
+# pressed DOOR_UNLOCK_MS ago, or it has stood open for DOOR_CLOSE_MS) or while it
+# slides. Deadlines wait in a heap ordered by time and sliding doors sit in
+# packed NumPy columns stepped together, so a tick costs one heap peek plus one
+# vectorized step over the doors actually moving, however many are waiting.
+
+UNLOCK, CLOSE = 0, 1 # Event kinds
+IDLE, PENDING, OPENING, OPEN, CLOSING = 0, 1, 2, 3, 4 # Per-tile door phase
+
+class Doors:
+    """Door automation for one level, writing the renderer's door_state / door_lock in place.
+
+    Tiles are rewritten through `set_tile` (so the occupancy grid follows): a
+    pressed door shows `switch_id` until it has closed again, then goes back to
+    3 if it was locked and 4 otherwise.
+    """
+    def __init__(self, world_map, door_state, door_lock, set_tile, switch_id=6, capacity=16):
+        self.world_map, self.door_state, self.door_lock = world_map, door_state, door_lock
+        self.set_tile, self.switch_id = set_tile, switch_id
+        self.phase = np.zeros(world_map.shape, dtype=np.int8)
+        self.cells = np.nonzero(np.isin(world_map, (3, 4, switch_id))) # Door tiles never become anything else, and only they have a door_state
+        self.events, self.seq = [], 0 # Heap of (due_ms, seq, kind, x, y); seq keeps equal deadlines in push order
+        self.x = np.empty(capacity, dtype=np.int64) # Moving doors, packed into the first `count` slots
+        self.y = np.empty(capacity, dtype=np.int64)
+        self.rate = np.empty(capacity, dtype=np.float32) # +DOOR_STEP opening, -DOOR_STEP closing
+        self.count = 0
+        self.passable_version = 0 # Bumped whenever a door becomes walkable or stops being so (flow field rebuilds on it)
+        self.version = 0 # Bumped on every write to door_state (render snapshots re-copy on it)
+
+    def __len__(self): return self.count
+
+    def schedule(self, due, kind, x, y):
+        heapq.heappush(self.events, (due, self.seq, kind, x, y)); self.seq += 1
+
+    def start(self, x, y, rate):
+        if self.count == len(self.x):
+            self.x, self.y, self.rate = (np.concatenate((a, np.empty_like(a))) for a in (self.x, self.y, self.rate))
+        i = self.count
+        self.x[i], self.y[i], self.rate[i] = x, y, rate
+        self.phase[x, y] = OPENING if rate > 0 else CLOSING; self.count += 1
+
+    def stop(self, i):
+        last = self.count - 1
+        self.x[i], self.y[i], self.rate[i] = self.x[last], self.y[last], self.rate[last]
+        self.count = last
+
+    def press(self, x, y, now):
+        """Flips the switch of the shut door at (x, y): it starts opening DOOR_UNLOCK_MS later. Returns whether it did."""
+        if self.phase[x, y] != IDLE: return False
+        cell = self.world_map[x, y]
+        if cell == 3 and self.door_lock[x, y] == 0: self.door_lock[x, y] = 1
+        elif not (cell == 4 and self.door_state[x, y] < 0.1): return False
+        self.set_tile(x, y, self.switch_id); self.phase[x, y] = PENDING
+        self.schedule(now + DOOR_UNLOCK_MS, UNLOCK, x, y)
+        return True
+
+    def update(self, now, player_x, player_y):
+        # 1. Due switches start their doors opening this very tick; due closes wait for the step
+        closing = []
+        while self.events and self.events[0][0] <= now:
+            _, _, kind, x, y = heapq.heappop(self.events)
+            if kind == UNLOCK: self.start(x, y, DOOR_STEP)
+            else: closing.append((x, y))
+
+        # 2. Slide every moving door at once
+        n = self.count
+        if n:
+            xs, ys = self.x[:n], self.y[:n]
+            before = self.door_state[xs, ys]
+            state = np.clip(before + self.rate[:n], 0.0, 1.0)
+            self.door_state[xs, ys] = state; self.version += 1
+            if np.any((before > 0.8) != (state > 0.8)): self.passable_version += 1 # Same threshold as flowfield.walkable
+            for i in np.flatnonzero((state >= 1.0) | (state <= 0.0))[::-1]: # Highest first, so stop() only moves unvisited doors
+                x, y = int(xs[i]), int(ys[i])
+                if self.rate[i] > 0:
+                    self.phase[x, y] = OPEN; self.schedule(now + DOOR_CLOSE_MS, CLOSE, x, y)
+                else:
+                    self.phase[x, y] = IDLE
+                    if self.door_lock[x, y] == 1: self.set_tile(x, y, 3); self.door_lock[x, y] = 0
+                    else: self.set_tile(x, y, 4)
+                self.stop(i)
+
+        # 3. Open doors close once the player is out of the doorway, checked again every tick until they are
+        for x, y in closing:
+            if math.hypot(player_x - (x + 0.5) * TILE_SIZE, player_y - (y + 0.5) * TILE_SIZE) > TILE_SIZE: self.start(x, y, -DOOR_STEP)
+            else: self.schedule(now + TICK_MS, CLOSE, x, y)
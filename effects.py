@@ -0,0 +1,31 @@
+import pygame
+from settings import *
+
+# --- SCREEN EFFECTS ---
+# Full-screen tints and fades used by overlays and transitions. Every Surface is
+# made once and only has its alpha changed per frame, so menus, pauses and
+# fades blit without allocating an 800x600 Surface each frame.
+
+class Overlays:
+    """One preallocated full-screen Surface per tint colour."""
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.size = size
+        self.surfaces = {}
+
+    def get(self, color, alpha):
+        surf = self.surfaces.get(color)
+        if surf is None:
+            surf = self.surfaces[color] = pygame.Surface(self.size); surf.fill(color)
+        surf.set_alpha(alpha)
+        return surf
+
+    def tint(self, screen, color, alpha):
+        screen.blit(self.get(color, alpha), (0, 0))
+
+class Fade:
+    """A private copy of an image whose alpha is changed in place, leaving the original untouched."""
+    def __init__(self, image):
+        self.image = image.copy()
+
+    def draw(self, screen, alpha, pos=(0, 0)):
+        self.image.set_alpha(alpha); screen.blit(self.image, pos)
@@ -0,0 +1,120 @@
+import math
+import numpy as np
+from settings import *
+from raycaster import cached_jit
+from spatial import SpatialGrid, grid_move, grid_near, grid_unlink
+from flowfield import FlowField, FLOW_DIRS, walkable
+
+# --- ENTITY STORE ---
+# Enemies and pickups live in parallel NumPy columns (one slot per entity,
+# never reordered) instead of a list of dicts, so the per-tick work runs as one
+# jitted loop no matter how many hundreds of them a map spawns. Each store
+# files its live slots in a SpatialGrid for proximity and hitscan queries.
+
+PICKUP_TYPES = ('health', 'ammo', 'armor')
+
+@cached_jit()
+def step_enemies(x, y, health, frame, anim_timer, player_x, player_y, world_map, door_state, dist, flow, head, nxt, prv, cell):
+    """Animates and moves every live enemy one tick towards the player. Returns how many are touching them.
+
+    Enemies follow the flow field until they are on or next to the player's
+    tile (or off the field), then steer straight at the player.
+    """
+    width, height = world_map.shape
+    contacts = 0
+    for i in range(x.shape[0]):
+        if health[i] <= 0: continue
+        anim_timer[i] += 1
+        if anim_timer[i] >= ENEMY_ANIM_TICKS:
+            anim_timer[i] = 0; frame[i] = 1 - frame[i]
+        d = math.hypot(player_x - x[i], player_y - y[i])
+        if d > 40:
+            cx, cy = int(x[i] // TILE_SIZE), int(y[i] // TILE_SIZE)
+            if dist[cx, cy] > 1: nx, ny = FLOW_DIRS[flow[cx, cy], 0], FLOW_DIRS[flow[cx, cy], 1]
+            else: nx, ny = (player_x - x[i]) / d, (player_y - y[i]) / d
+            if walkable(world_map, door_state, int((x[i] + nx * ENEMY_STEP) // TILE_SIZE), int(y[i] // TILE_SIZE)): x[i] += nx * ENEMY_STEP
+            if walkable(world_map, door_state, int(x[i] // TILE_SIZE), int((y[i] + ny * ENEMY_STEP) // TILE_SIZE)): y[i] += ny * ENEMY_STEP
+            grid_move(head, nxt, prv, cell, i, x[i], y[i], width, height)
+        else: contacts += 1
+    return contacts
+
+@cached_jit()
+def collect_pickups(x, y, kind, collected, player_x, player_y, health, ammo, armor, head, nxt, prv, cell, width, height, found):
+    """Picks up everything within reach the player still has room for, in slot order. Returns the new (health, ammo, armor)."""
+    count = grid_near(head, nxt, x, y, width, height, player_x, player_y, 75.0, found)
+    reach = np.sort(found[:count])
+    for i in reach:
+        if kind[i] == 0 and health < MAX_HEALTH: health = min(MAX_HEALTH, health + 25); collected[i] = True
+        elif kind[i] == 1 and ammo < MAX_AMMO: ammo = min(MAX_AMMO, ammo + 20); collected[i] = True
+        elif kind[i] == 2 and armor < 100: armor = min(100, armor + 25); collected[i] = True
+        if collected[i]: grid_unlink(head, nxt, prv, cell, i)
+    return health, ammo, armor
+
+class Enemies:
+    """Enemy columns: position, health, walk-cycle frame and its timer, hit flash timer."""
+    def __init__(self, shape, x=(), y=()):
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.health = np.full(len(self.x), ENEMY_HEALTH, dtype=np.float64)
+        self.frame = np.zeros(len(self.x), dtype=np.int64)
+        self.anim_timer = np.zeros(len(self.x), dtype=np.int64)
+        self.hit_timer = np.zeros(len(self.x), dtype=np.int64)
+        self.prev_x, self.prev_y = self.x.copy(), self.y.copy() # Positions one tick ago, for render interpolation
+        self.grid = SpatialGrid(shape, self.x, self.y, self.alive())
+
+    @classmethod
+    def from_tiles(cls, shape, spawns):
+        spawns = np.asarray(spawns, dtype=np.float64).reshape(-1, 2) * TILE_SIZE
+        return cls(shape, spawns[:, 0], spawns[:, 1])
+
+    def __len__(self): return len(self.x)
+
+    def alive(self): return self.health > 0
+
+    def damage(self, i, amount):
+        self.health[i] -= amount; self.hit_timer[i] = 5
+        if self.health[i] <= 0: self.grid.remove(i)
+
+    def save_previous(self):
+        self.prev_x[:] = self.x; self.prev_y[:] = self.y
+
+    def interpolated(self, alpha):
+        """Positions `alpha` of the way from the previous tick to the current one."""
+        return self.prev_x + (self.x - self.prev_x) * alpha, self.prev_y + (self.y - self.prev_y) * alpha
+
+    def update(self, player_x, player_y, world_map, door_state, field):
+        g = self.grid
+        return step_enemies(self.x, self.y, self.health, self.frame, self.anim_timer, float(player_x), float(player_y), world_map, door_state, field.dist, field.flow, g.head, g.next, g.prev, g.cell)
+
+class Pickups:
+    """Pickup columns: position, type (index into PICKUP_TYPES), collected flag."""
+    def __init__(self, shape, x=(), y=(), kind=()):
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.kind = np.array(kind, dtype=np.int64)
+        self.collected = np.zeros(len(self.x), dtype=np.bool_)
+        self.grid = SpatialGrid(shape, self.x, self.y, self.active())
+
+    @classmethod
+    def from_tiles(cls, shape, locations):
+        return cls(shape, [p[0] * TILE_SIZE for p in locations], [p[1] * TILE_SIZE for p in locations], [PICKUP_TYPES.index(p[2]) for p in locations])
+
+    def __len__(self): return len(self.x)
+
+    def active(self): return ~self.collected
+
+    def collect(self, player_x, player_y, health, ammo, armor):
+        g = self.grid
+        return collect_pickups(self.x, self.y, self.kind, self.collected, float(player_x), float(player_y), float(health), int(ammo), int(armor), g.head, g.next, g.prev, g.cell, g.width, g.height, g.found)
+
+def warmup():
+    """Loads (or compiles) the entity, spatial grid and flow field kernels with the game's array types."""
+    world_map = np.ones((3, 3), dtype=np.int32)
+    door_state = np.zeros((3, 3), dtype=np.float32)
+    field = FlowField(world_map)
+    field.update(world_map, door_state, 0.0, 0.0)
+    enemies = Enemies(world_map.shape, [1.5 * TILE_SIZE], [1.5 * TILE_SIZE])
+    enemies.update(0.0, 0.0, world_map, door_state, field)
+    enemies.grid.near(0.0, 0.0, 75.0); enemies.grid.along(0.0, 0.0, 0.0, 30.0)
+    enemies.damage(0, ENEMY_HEALTH)
+    Pickups(world_map.shape, [0.0], [0.0], [0]).collect(0.0, 0.0, 0.0, 0, 0)
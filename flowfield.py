@@ -0,0 +1,84 @@
+import numpy as np
+from settings import *
+from raycaster import cached_jit
+
+# --- FLOW FIELD PATHFINDING ---
+# One BFS from the player's tile over world_map gives every tile within
+# FLOW_FIELD_RADIUS steps its step count to the player and the index of its best
+# neighbour. Enemies just read the direction of the tile they stand on, so
+# steering costs the same per enemy however many there are. The BFS only reruns
+# when the player changes tile or the door system reports a door crossing the
+# walkable threshold, and only resets the tiles the previous build reached, so
+# its cost follows the radius rather than the map size.
+
+# Unit vector per direction index (dx + 1) * 3 + (dy + 1); FLOW_NONE (0, 0) means "already there"
+FLOW_DIRS = np.array([(dx * (1.0 / np.sqrt(dx * dx + dy * dy)), dy * (1.0 / np.sqrt(dx * dx + dy * dy))) if dx or dy else (0.0, 0.0) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+FLOW_NONE = 4
+
+@cached_jit(inline='always')
+def walkable(world_map, door_state, cx, cy):
+    """Open floor, or a door far enough open to walk through (same rule as Game.is_solid)."""
+    if cx < 0 or cy < 0 or cx >= world_map.shape[0] or cy >= world_map.shape[1]: return False
+    cell = world_map[cx, cy]
+    return cell == 0 or ((cell == 3 or cell == 4 or cell == 6) and door_state[cx, cy] > 0.8)
+
+@cached_jit()
+def build_flow_field(world_map, door_state, target_x, target_y, radius, dist, flow, queue, count):
+    """BFS up to `radius` steps from (target_x, target_y) into dist (-1 = off the field), then direction indices into flow.
+
+    queue[:count] are the tiles the previous build reached; only those are reset.
+    Returns the number of tiles this build reached (they are left in queue).
+    """
+    width, height = world_map.shape
+    for i in range(count):
+        c = queue[i]; dist[c // height, c % height] = -1; flow[c // height, c % height] = FLOW_NONE
+    if not (0 <= target_x < width and 0 <= target_y < height): return 0
+    dist[target_x, target_y] = 0
+    queue[0] = target_x * height + target_y
+    read, write = 0, 1
+    while read < write:
+        c = queue[read]; read += 1
+        cx, cy = c // height, c % height
+        if dist[cx, cy] >= radius: continue
+        for k in range(4):
+            nx, ny = cx + (1, -1, 0, 0)[k], cy + (0, 0, 1, -1)[k]
+            if walkable(world_map, door_state, nx, ny) and dist[nx, ny] < 0:
+                dist[nx, ny] = dist[cx, cy] + 1
+                queue[write] = nx * height + ny; write += 1
+
+    # Point every tile at its closest neighbour (diagonals only when both sides are open, so nobody cuts a wall corner)
+    for i in range(write):
+        cx, cy = queue[i] // height, queue[i] % height
+        best, best_dx, best_dy = dist[cx, cy], 0, 0
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                if (dx == 0 and dy == 0) or not (0 <= cx + dx < width and 0 <= cy + dy < height): continue
+                d = dist[cx + dx, cy + dy]
+                if d < 0 or d >= best: continue
+                if dx != 0 and dy != 0 and not (walkable(world_map, door_state, cx + dx, cy) and walkable(world_map, door_state, cx, cy + dy)): continue
+                best, best_dx, best_dy = d, dx, dy
+        flow[cx, cy] = (best_dx + 1) * 3 + best_dy + 1
+    return write
+
+class FlowField:
+    """Per-tile step counts (int16) and direction indices (int8, into FLOW_DIRS) towards the player for one level's world_map."""
+    def __init__(self, world_map, radius=FLOW_FIELD_RADIUS):
+        self.radius = min(radius, np.iinfo(np.int16).max - 1)
+        self.dist = np.full(world_map.shape, -1, dtype=np.int16)
+        self.flow = np.full(world_map.shape, FLOW_NONE, dtype=np.int8)
+        self.queue = np.empty(min(world_map.size, 2 * self.radius * (self.radius + 1) + 1), dtype=np.int32) # Tiles within `radius` steps
+        self.count = 0 # Tiles the last build reached
+        self.target, self.doors_version = None, None
+        self.builds = 0
+
+    def build(self, world_map, door_state, target_x, target_y):
+        self.count = build_flow_field(world_map, door_state, target_x, target_y, self.radius, self.dist, self.flow, self.queue, self.count)
+        self.builds += 1
+
+    def update(self, world_map, door_state, player_x, player_y, doors_version=0):
+        """Rebuilds the field if the player stepped onto another tile or doors_version (bumped by the door system whenever a door becomes walkable or stops being so) moved on."""
+        target = (int(player_x // TILE_SIZE), int(player_y // TILE_SIZE))
+        if target == self.target and doors_version == self.doors_version: return False
+        self.target, self.doors_version = target, doors_version
+        self.build(world_map, door_state, *target)
+        return True
@@ -0,0 +1,63 @@
+import math
+import numpy as np
+from settings import *
+from raycaster import cached_jit
+from spatial import grid_along, grid_unlink
+from flowfield import walkable
+
+# --- HITSCAN ---
+# Each pellet is cut short by the first wall (or closed door) a DDA over
+# world_map runs into, then the spatial grid picks the nearest enemy on the
+# remaining stretch. Both walks stop early, so a shot costs a few tiles no
+# matter how many enemies are on the map.
+
+@cached_jit()
+def wall_distance(world_map, door_state, ox, oy, dir_x, dir_y):
+    """Distance from (ox, oy) along the unit ray to the first tile nothing can walk through (the map edge counts)."""
+    map_x, map_y = int(ox // TILE_SIZE), int(oy // TILE_SIZE)
+    step_x, step_y = (1 if dir_x >= 0 else -1), (1 if dir_y >= 0 else -1)
+    delta_x = abs(TILE_SIZE / dir_x) if dir_x != 0 else 1e30
+    delta_y = abs(TILE_SIZE / dir_y) if dir_y != 0 else 1e30
+    side_x = (((map_x + 1) * TILE_SIZE - ox) if dir_x >= 0 else (ox - map_x * TILE_SIZE)) / abs(dir_x) if dir_x != 0 else 1e30
+    side_y = (((map_y + 1) * TILE_SIZE - oy) if dir_y >= 0 else (oy - map_y * TILE_SIZE)) / abs(dir_y) if dir_y != 0 else 1e30
+    while True:
+        if side_x < side_y: t = side_x; side_x += delta_x; map_x += step_x
+        else: t = side_y; side_y += delta_y; map_y += step_y
+        if not walkable(world_map, door_state, map_x, map_y): return t
+
+@cached_jit()
+def fire_pellets(world_map, door_state, x, y, health, hit_timer, head, nxt, prv, cell, ox, oy, angles, half_width, damage, hits, ranges):
+    """Traces one pellet per angle, damaging the nearest enemy in front of the wall.
+
+    hits[k] is the enemy slot pellet k struck (or -1), ranges[k] how far it
+    flew. Damage lands before the next pellet is traced, so a pellet that kills
+    lets the following ones through to whoever stands behind.
+    """
+    width, height = world_map.shape
+    for k in range(angles.shape[0]):
+        dir_x, dir_y = math.cos(angles[k]), math.sin(angles[k])
+        wall = wall_distance(world_map, door_state, ox, oy, dir_x, dir_y)
+        i = grid_along(head, nxt, x, y, width, height, ox, oy, dir_x, dir_y, half_width, wall)
+        hits[k] = i
+        if i < 0: ranges[k] = wall; continue
+        ranges[k] = (x[i] - ox) * dir_x + (y[i] - oy) * dir_y
+        health[i] -= damage; hit_timer[i] = 5
+        if health[i] <= 0: grid_unlink(head, nxt, prv, cell, i)
+
+def fire(enemies, world_map, door_state, ox, oy, angles, half_width=HIT_RADIUS, damage=PELLET_DAMAGE):
+    """Fires one pellet per angle from (ox, oy). Returns (hits, ranges) per pellet."""
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    hits, ranges = np.empty(len(angles), dtype=np.int64), np.empty(len(angles), dtype=np.float64)
+    g = enemies.grid
+    fire_pellets(world_map, door_state, enemies.x, enemies.y, enemies.health, enemies.hit_timer, g.head, g.next, g.prev, g.cell, float(ox), float(oy), angles, float(half_width), float(damage), hits, ranges)
+    return hits, ranges
+
+def spread(angle, pellets=PELLETS, cone=PELLET_SPREAD, rng=np.random):
+    """Pellet angles scattered uniformly within `cone` either side of `angle` (all on it when cone is 0)."""
+    return angle + (rng.uniform(-cone, cone, pellets) if cone > 0 else np.zeros(pellets))
+
+def warmup():
+    """Loads (or compiles) the hitscan kernels with the game's array types."""
+    from entities import Enemies
+    world_map = np.ones((3, 3), dtype=np.int32); world_map[1, 1] = 0
+    fire(Enemies(world_map.shape, [1.5 * TILE_SIZE], [1.5 * TILE_SIZE]), world_map, np.zeros((3, 3), dtype=np.float32), 1.2 * TILE_SIZE, 1.5 * TILE_SIZE, spread(0.0, 1, 0.0))
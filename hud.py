@@ -0,0 +1,62 @@
+from collections import OrderedDict
+import pygame
+from settings import *
+
+# --- RETAINED HUD ---
+# The status bar (AMMO / HEALTH / ARMOR boxes and the face) lives in one
+# retained Surface. Each widget remembers the value it last drew and only
+# repaints its own rectangle when that value changes; every frame then costs a
+# single blit of the finished bar. All text goes through a TextCache, so the
+# compass letter, FPS counter and prompts are rendered once per distinct string.
+
+class TextCache:
+    """Rendered text Surfaces keyed on (font, text, color), evicted LRU past `capacity` entries."""
+    def __init__(self, capacity=HUD_TEXT_CACHE):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key); self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.surfaces[key] = font.render(text, True, color)
+        if len(self.surfaces) > self.capacity: self.surfaces.popitem(last=False)
+        return surf
+
+class StatusBar:
+    """The bottom HUD panel, repainted only in the rectangles of widgets whose value changed."""
+    def __init__(self, background, label_font, value_font, faces, text):
+        self.background, self.label_font, self.value_font, self.faces, self.text = background, label_font, value_font, faces, text
+        self.panel = background.copy()
+        self.boxes = {"AMMO": (pygame.Rect(20, 15, 100, HUD_HEIGHT - 30), False),
+                      "HEALTH": (pygame.Rect(140, 15, 100, HUD_HEIGHT - 30), True),
+                      "ARMOR": (pygame.Rect(SCREEN_WIDTH - 260, 15, 100, HUD_HEIGHT - 30), True)}
+        self.face_rect = pygame.Rect(SCREEN_WIDTH // 2 - 40, 10, 80, 80)
+        self.values = {} # Widget -> value it was last painted with
+
+    def update(self, ammo, health, armor, face):
+        for label, value in (("AMMO", int(ammo)), ("HEALTH", int(health)), ("ARMOR", int(armor))):
+            if self.values.get(label) != value: self.paint_box(label, value)
+        if self.values.get("face") != face: self.paint_face(face)
+
+    def paint_box(self, label, value):
+        r, percent = self.boxes[label]
+        self.panel.blit(self.background, r, r)
+        pygame.draw.rect(self.panel, DOOM_BEVEL_DARK, r); pygame.draw.rect(self.panel, DOOM_BEVEL_LIGHT, r, 2)
+        ls = self.text.render(self.label_font, label, DOOM_GOLD); self.panel.blit(ls, (r.x + (r.w - ls.get_width()) // 2, r.y + 4))
+        vs = self.text.render(self.value_font, f"{value}{'%' if percent else ''}", DOOM_RED); self.panel.blit(vs, (r.x + (r.w - vs.get_width()) // 2, r.y + 18))
+        self.values[label] = value
+
+    def paint_face(self, face):
+        fr = self.face_rect
+        pygame.draw.rect(self.panel, (0, 0, 0), fr)
+        self.panel.blit(self.faces[face], (fr.x + 8, fr.y + 8)); pygame.draw.rect(self.panel, DOOM_BEVEL_LIGHT, fr, 3)
+        self.values["face"] = face
+
+    def draw(self, screen):
+        # The 3D view is presented over the whole screen every frame, so the whole bar goes back on top
+        screen.blit(self.panel, (0, SCREEN_HEIGHT - HUD_HEIGHT))
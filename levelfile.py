@@ -0,0 +1,124 @@
+"""Compiled binary levels (.hgl).
+
+    python -m levelfile [--levels 0 1]    # converts levels.LEVELS entries into maps/
+
+A 32-byte header, then 8-byte aligned sections:
+
+    tiles     uint8   (size_x, size_y)   tile id per cell, x-major like world_map
+    door_dir  uint8   (size_x, size_y)   1 = door with walls left and right
+    spawns    float64 (n_spawns, 2)      enemy spawn points, in tiles
+    pickups   float64 (n_pickups, 2)     pickup positions, in tiles
+    kinds     uint8   (n_pickups,)       index into entities.PICKUP_TYPES
+
+The loader maps every section straight out of the file with np.memmap, so
+nothing is parsed per cell, and keeps loaded levels in memory. Where maps/
+can't be written (read-only install), levels are built in memory instead.
+"""
+import os
+import sys
+import struct
+import argparse
+import tempfile
+import numpy as np
+import levels
+from entities import PICKUP_TYPES
+
+MAGIC, VERSION = b"HGLV", 1
+HEADER = struct.Struct("<4sHHIIII8x") # magic, version, reserved, size_x, size_y, n_spawns, n_pickups
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps")
+
+class Level:
+    """One level's arrays (read-only when memory-mapped) plus where they came from."""
+    def __init__(self, tiles, door_dir, spawns, pickups, kinds, path=None):
+        self.tiles, self.door_dir = tiles, door_dir
+        self.spawns, self.pickups, self.kinds = spawns, pickups, kinds
+        self.path = path
+
+    @property
+    def size(self): return self.tiles.shape
+
+def sections(size_x, size_y, n_spawns, n_pickups):
+    """[(name, dtype, shape, offset)] in file order, and the total file size."""
+    layout, offset = [], HEADER.size
+    for name, dtype, shape in (("tiles", np.uint8, (size_x, size_y)), ("door_dir", np.uint8, (size_x, size_y)),
+                               ("spawns", np.float64, (n_spawns, 2)), ("pickups", np.float64, (n_pickups, 2)), ("kinds", np.uint8, (n_pickups,))):
+        layout.append((name, dtype, shape, offset))
+        offset += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+    return layout, offset
+
+def door_dirs(tiles):
+    """1 where a door (3 / 4) has something solid on both its left and right."""
+    solid = tiles != 0
+    left, right = np.zeros_like(solid), np.zeros_like(solid)
+    left[1:], right[:-1] = solid[:-1], solid[1:]
+    return (np.isin(tiles, (3, 4)) & left & right).astype(np.uint8)
+
+def from_dict(lvl):
+    """Converts a levels.py dict into a Level."""
+    sx, sy = lvl['MAP_SIZE_X'], lvl['MAP_SIZE_Y']
+    tiles = (np.frombuffer(lvl['MAP_STRING'].encode('ascii'), dtype=np.uint8) - ord('0')).reshape(sy, sx).T.copy()
+    spawns = np.array(lvl['SPAWN_LOCATIONS'], dtype=np.float64).reshape(-1, 2)
+    pickups = np.array([p[:2] for p in lvl['PICKUP_LOCATIONS']], dtype=np.float64).reshape(-1, 2)
+    kinds = np.array([PICKUP_TYPES.index(p[2]) for p in lvl['PICKUP_LOCATIONS']], dtype=np.uint8)
+    return Level(tiles, door_dirs(tiles), spawns, pickups, kinds)
+
+def write(level, path):
+    sx, sy = level.size
+    layout, total = sections(sx, sy, len(level.spawns), len(level.pickups))
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    # A uniquely named temp file renamed into place: never a half-written level, and concurrent converts don't collide
+    with tempfile.NamedTemporaryFile(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False) as f:
+        try:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, sx, sy, len(level.spawns), len(level.pickups)))
+            for name, dtype, shape, offset in layout:
+                f.seek(offset); f.write(np.ascontiguousarray(getattr(level, name), dtype=dtype).tobytes())
+            f.truncate(total)
+        except BaseException:
+            f.close(); os.unlink(f.name); raise
+    os.replace(f.name, path)
+
+def read(path):
+    """Memory-maps a .hgl file; only the header is parsed."""
+    with open(path, "rb") as f: magic, version, _, sx, sy, n_spawns, n_pickups = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION: raise ValueError(f"{path}: not a version {VERSION} level file")
+    arrays = {}
+    for name, dtype, shape, offset in sections(sx, sy, n_spawns, n_pickups)[0]:
+        arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape) if np.prod(shape) else np.empty(shape, dtype=dtype)
+    return Level(path=path, **arrays)
+
+def level_path(index):
+    return os.path.join(LEVEL_DIR, f"level_{index + 1}.hgl")
+
+def convert(index):
+    path = level_path(index)
+    write(from_dict(levels.LEVELS[index]), path)
+    return path
+
+_cache = {}
+
+def load(index):
+    """levels.LEVELS[index] as a memory-mapped Level, (re)converted first if its file is missing or older than levels.py.
+
+    If the file can't be written, the level is built in memory from levels.py instead.
+    """
+    level = _cache.get(index)
+    if level is None:
+        path = level_path(index)
+        try:
+            if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(levels.__file__): convert(index)
+            level = read(path)
+        except OSError as e:
+            print(f"levelfile: can't write {path} ({e.strerror}), building level {index + 1} in memory", file=sys.stderr)
+            level = from_dict(levels.LEVELS[index])
+        _cache[index] = level
+    return level
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile levels.py maps into .hgl level files")
+    parser.add_argument("--levels", type=int, nargs="*", help="level indices (default: all)")
+    args = parser.parse_args(argv)
+    for i in (args.levels if args.levels else range(len(levels.LEVELS))): print(convert(i))
+
+if __name__ == "__main__":
+    main()
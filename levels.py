@@ -1,7 +1,3 @@
-# --- GLOBAL VARIABLES FOR RAYCASTER (PHASE 1 COMPATIBILITY) ---
-MAP_SIZE_X = 24
-MAP_SIZE_Y = 24
-
 # --- LEVEL 1 DATA ---
 LEVEL_1 = {
     "MAP_SIZE_X": 24,
@@ -72,4 +68,6 @@ LEVEL_2 = {
 }
 
 # --- THE MASTER LEVEL LIST ---
+# A level may also carry "TEXTURES": {tile id / 'floor' / 'ceil': filename} to replace the
+# shared textures for that level only (loaded by the prefetcher with the rest of the level).
 LEVELS = [LEVEL_1, LEVEL_2]
\ No newline at end of file
@@ -5,15 +5,30 @@ import random
 import sys
 import json  # For saving/loading profiles
 import os    # To check if the save file exists
+import threading
+import time
+import argparse
 
 # Import our custom modules
 from settings import *
 import assets
 import raycaster
 import levels
+import resolution
+import profiler
+import entities
+import hitscan
+import pipeline
+import levelfile
+import prefetch
+import occupancy
+import hud
+import effects
+import postfx
+import doors
 
 class Game:
-    def __init__(self):
+    def __init__(self, dynamic_res=DYNAMIC_RES, pipelined=PIPELINED_RENDER):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
@@ -23,6 +38,12 @@ class Game:
         print("Compiling Engine & Loading Assets...")
         self.assets = assets.AssetManager()
         self.assets.load_all()
+        self.render_kernel = raycaster.select_kernel()
+        self.postfx_kernel, self.effects = postfx.select_kernel(), postfx.EffectStack()
+        self.prefetcher = prefetch.LevelPrefetcher(self.assets)
+        # Load / compile the kernel in the background while the menus and loading screen run
+        self.warmup_thread = threading.Thread(target=self.warmup, daemon=True)
+        self.warmup_thread.start()
 
         # The green activated door is natively loaded by assets.py at Map ID 6
         self.green_switch_id = 6
@@ -38,6 +59,13 @@ class Game:
             self.custom_ui_font = pygame.font.SysFont("Arial", 40)
             self.custom_ui_font_small = pygame.font.SysFont("Arial", 20)
             self.compass_font = pygame.font.SysFont("Arial", 32, bold=True)
+
+        # Retained HUD: the status bar repaints only changed widgets, all HUD text is rendered once per string
+        self.text_cache = hud.TextCache()
+        self.status_bar = hud.StatusBar(self.assets.images['hud_bg'], self.custom_ui_font_small, self.custom_ui_font, self.assets.faces, self.text_cache)
+        # Tints and the loading fade reuse preallocated Surfaces; menus and overlays render text through text_cache
+        self.overlays = effects.Overlays()
+        self.loading_fade = effects.Fade(self.assets.images['loading'])
         
         # --- GAME STATES & MENUS ---
         self.state = "menu"
@@ -63,11 +91,14 @@ class Game:
         
         # --- OPTIONS MENU VARIABLES ---
         self.options_selected = 0
-        self.options_menu = ["MOUSE SENSITIVITY", "CROSSHAIR COLOR", "SHOW FPS", "CONTROLS", "BACK"]
+        self.options_menu = ["MOUSE SENSITIVITY", "CROSSHAIR COLOR", "SHOW FPS", "DYNAMIC RES", "CONTROLS", "BACK"]
         
         # Editable Settings
         self.mouse_sens = MOUSE_SENSITIVITY
         self.show_fps = False
+        self.resolution = resolution.DynamicResolution(dynamic_res)
+        self.profiler = profiler.FrameProfiler()
+        self.sprite_kernel = SPRITE_KERNEL
         self.crosshair_colors = [
             (CROSSHAIR_COLOR, "DEFAULT"), 
             ((255, 0, 0), "RED"), 
@@ -85,19 +116,28 @@ class Game:
             "LEFT CLICK - Fire Weapon",
             "R - Reload",
             "E - Interact (Doors/Switches)",
-            "ESC / P - Pause Game"
+            "ESC / P - Pause Game",
+            "F3 - Frame Profiler / F4 - Save Trace"
         ]
         
         # Loading Vars
         self.loading_phase = 0
         self.loading_alpha = 0
         self.loading_timer = 0
-        self.fade_speed = 5
+        self.fade_speed = LOADING_FADE_STEP
 
+        self.sim_ms = 0.0 # Simulation clock: advances TICK_MS per gameplay tick, stands still while paused
+        self.map_version = 0 # Bumped whenever world_map / occupancy change or a new level is swapped in (see pipeline.Snapshot)
+        self.pipeline = None
         self.reset_game_data()
         
-        self.screen_buffer = np.zeros((SCREEN_WIDTH, SCREEN_HEIGHT, 3), dtype=np.int32)
+        # The kernel writes straight into the pixels of a persistent Surface: no per-frame allocation or conversion
+        self.frame_pixels, self.screen_buffer = raycaster.make_frame_buffer()
+        self.frame_surface = pygame.image.frombuffer(self.frame_pixels, (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGBX')
+        self.upscale_surface = self.frame_surface.copy() # Dynamic resolution upscales into this, never a new Surface
         self.depth_buffer = np.zeros(SCREEN_WIDTH, dtype=np.float32)
+        self.floor_ao, self.row_shade = raycaster.build_floor_tables()
+        if pipelined: self.pipeline = pipeline.RenderPipeline(self) # Swaps its finished frames into frame_surface / depth_buffer
 
     # --- JSON SAVE SYSTEM ---
     def load_profiles(self):
@@ -115,25 +155,27 @@ class Game:
 
     # --- LEVEL INIT & RESET ---
     def init_map(self):
-        lvl = levels.LEVELS[self.current_level]
-        self.map_size_x = lvl['MAP_SIZE_X']
-        self.map_size_y = lvl['MAP_SIZE_Y']
-        
-        self.world_map = np.zeros((self.map_size_x, self.map_size_y), dtype=np.int32)
-        self.door_state = np.zeros((self.map_size_x, self.map_size_y), dtype=np.float32) 
-        self.door_lock = np.zeros((self.map_size_x, self.map_size_y), dtype=np.int32)
-        self.door_dir = np.zeros((self.map_size_x, self.map_size_y), dtype=np.int32) 
+        # Usually staged in the background while the previous level was played; built here on a miss
+        staged = self.prefetcher.take(self.current_level)
+        self.level = staged.level
+        self.map_size_x, self.map_size_y = self.level.size
         
-        for j, char in enumerate(lvl['MAP_STRING']):
-            x, y = j % self.map_size_x, j // self.map_size_x
-            val = int(char)
-            self.world_map[x, y] = val
-            if val in [3, 4]:
-                left = self.world_map[x-1, y] if x > 0 else 0
-                right = self.world_map[x+1, y] if x < self.map_size_x-1 else 0
-                self.door_dir[x, y] = 1 if (left != 0 and right != 0) else 0
-
-    def reset_game_data(self):
+        self.world_map, self.door_state, self.door_lock, self.door_dir = staged.world_map, staged.door_state, staged.door_lock, staged.door_dir
+        self.occupancy = staged.occupancy
+        self.map_version += 1
+        self.doors = doors.Doors(self.world_map, self.door_state, self.door_lock, self.set_tile, self.green_switch_id)
+        self.enemies, self.pickups, self.flow_field = staged.enemies, staged.pickups, staged.flow_field
+        self.wall_textures, self.floor_texture, self.ceil_texture = staged.wall_textures, staged.floor_texture, staged.ceil_texture
+
+    def warmup(self):
+        raycaster.warmup(self.render_kernel)
+        postfx.warmup(self.postfx_kernel)
+        entities.warmup()
+        hitscan.warmup()
+
+    def reset_game_data(self, level=None):
+        t0 = time.perf_counter()
+        if self.pipeline: self.pipeline.drain() # The render worker may still be reading this level's arrays
         # 1. Load from profile if active, otherwise set defaults
         if self.active_profile and self.active_profile in self.profiles:
             p_data = self.profiles[self.active_profile]
@@ -144,8 +186,9 @@ class Game:
         else:
             self.current_level = 0
             self.health, self.ammo, self.armor = MAX_HEALTH, MAX_AMMO, 0
+        if level is not None: self.current_level = level # Explicit level (benchmarks / tools)
             
-        # 2. Build the map layout for the current level
+        # 2. Swap in the map layout and entities for the current level
         self.init_map()
         
         # 3. Spawn the player dynamically based on the map size
@@ -156,18 +199,20 @@ class Game:
         self.weapon_recoil, self.weapon_bob, self.screen_shake = 0.0, 0.0, 0.0
         self.damage_flash, self.muzzle_timer, self.last_shot = 0.0, 0, 0
         self.is_reloading, self.reload_timer = False, 0
-        self.unlock_timers, self.active_doors, self.open_timers = {}, {}, {}
-        
-        self.tracers, self.enemies, self.pickups = [], [], []
         
-        # Load entities from the current level
-        lvl = levels.LEVELS[self.current_level]
-        for sx, sy in lvl['SPAWN_LOCATIONS']:
-            self.enemies.append({'x': sx * TILE_SIZE, 'y': sy * TILE_SIZE, 'health': ENEMY_HEALTH, 'state': 'chase', 'frame': 0, 'anim_timer': 0, 'hit_timer': 0})
-        for px, py, pt in lvl['PICKUP_LOCATIONS']:
-            self.pickups.append({'x': px * TILE_SIZE, 'y': py * TILE_SIZE, 'type': pt, 'collected': False})
+        self.tracers = []
             
         self.face_state, self.face_timer, self.player_facing_door = 'center', 0, False
+        self.prev_x, self.prev_y = self.player_x, self.player_y
+        self.interpolate(1.0)
+
+        self.transition_ms = (time.perf_counter() - t0) * 1000.0
+        if self.profiler.enabled: print(f"Level {self.current_level + 1}: {self.prefetcher.summary()}, transition {self.transition_ms:.2f} ms", file=sys.stderr)
+        self.prefetcher.request(self.current_level + 1) # Stage the next level while this one is played
+
+    def start_loading(self):
+        self.state, self.loading_phase, self.loading_alpha = "loading", 0, 0
+        self.prefetcher.request(self.profiles[self.active_profile]["level"]) # Staged during the loading screen fade
 
     def get_compass_direction(self):
         dirs = ["E", "SE", "S", "SW", "W", "NW", "N", "NE"]
@@ -177,7 +222,7 @@ class Game:
 
     def reload_weapon(self):
         if self.ammo < MAX_AMMO and not self.is_reloading:
-            self.is_reloading, self.reload_timer = True, 60
+            self.is_reloading, self.reload_timer = True, RELOAD_TICKS
 
     # --- INPUT HANDLING ---
     def check_input(self):
@@ -217,7 +262,7 @@ class Game:
                     pygame.mouse.set_visible(False); pygame.event.set_grab(True)
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: return False
                 
-        if self.state == "game": self.handle_movement(); self.handle_shooting()
+        if self.state == "game": self.handle_look()
         return True
 
     def handle_menu_input(self, event):
@@ -277,7 +322,7 @@ class Game:
                 
                 if self.profile_list_mode == "continue":
                     self.active_profile = selected_name
-                    self.state, self.loading_phase, self.loading_alpha = "loading", 0, 0
+                    self.start_loading()
                 elif self.profile_list_mode == "delete":
                     del self.profiles[selected_name]
                     self.save_profiles()
@@ -295,7 +340,7 @@ class Game:
                     self.profiles[self.typing_name] = {"level": 0, "health": MAX_HEALTH, "ammo": MAX_AMMO, "armor": 0}
                     self.save_profiles()
                     self.active_profile = self.typing_name
-                    self.state, self.loading_phase, self.loading_alpha = "loading", 0, 0
+                    self.start_loading()
             elif event.key == pygame.K_BACKSPACE:
                 self.typing_name = self.typing_name[:-1]
             else:
@@ -326,13 +371,15 @@ class Game:
                 if self.options_selected == 0: self.mouse_sens = max(0.001, self.mouse_sens - 0.0005)
                 elif self.options_selected == 1: self.crosshair_idx = (self.crosshair_idx - 1) % len(self.crosshair_colors)
                 elif self.options_selected == 2: self.show_fps = not self.show_fps
+                elif self.options_selected == 3: self.resolution.enabled = not self.resolution.enabled
             elif event.key == pygame.K_RIGHT:
                 if self.options_selected == 0: self.mouse_sens = min(0.010, self.mouse_sens + 0.0005)
                 elif self.options_selected == 1: self.crosshair_idx = (self.crosshair_idx + 1) % len(self.crosshair_colors)
                 elif self.options_selected == 2: self.show_fps = not self.show_fps
+                elif self.options_selected == 3: self.resolution.enabled = not self.resolution.enabled
             elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                if self.options_selected == 3: self.state = "controls"
-                elif self.options_selected == 4: 
+                if self.options_selected == 4: self.state = "controls"
+                elif self.options_selected == 5: 
                     self.state = self.previous_state
                     if self.state == "game": pygame.mouse.set_visible(False); pygame.event.set_grab(True)
             elif event.key == pygame.K_ESCAPE:
@@ -348,6 +395,10 @@ class Game:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_e: self.interact()
             if event.key == pygame.K_r: self.reload_weapon()
+            if event.key == pygame.K_F3: self.profiler.toggle()
+            if event.key == pygame.K_F4 and self.profiler.enabled:
+                path = f"profile_trace_{pygame.time.get_ticks()}.json"
+                print(f"Saved {self.profiler.dump_chrome_trace(path)} frames to {path}")
             if event.key == pygame.K_ESCAPE or event.key == pygame.K_p:
                 self.state, self.pause_selected = "paused", 0
                 pygame.mouse.set_visible(True); pygame.event.set_grab(False)
@@ -355,22 +406,30 @@ class Game:
     def handle_shooting(self):
         if pygame.mouse.get_pressed()[0]: self.fire_weapon()
 
-    def handle_movement(self):
+    def handle_look(self):
+        # Mouse look runs every rendered frame so aiming never waits for a tick
         mdx, mdy = pygame.mouse.get_rel()
         self.player_angle += mdx * self.mouse_sens
         self.player_pitch = max(-HALF_HEIGHT, min(HALF_HEIGHT, self.player_pitch - mdy * MOUSE_PITCH_SENSITIVITY))
+
+    def handle_movement(self):
         keys = pygame.key.get_pressed()
         dx, dy = 0, 0
-        if keys[pygame.K_w]: dx, dy = math.cos(self.player_angle)*PLAYER_SPEED, math.sin(self.player_angle)*PLAYER_SPEED
-        if keys[pygame.K_s]: dx, dy = -math.cos(self.player_angle)*PLAYER_SPEED, -math.sin(self.player_angle)*PLAYER_SPEED
-        if keys[pygame.K_a]: dx, dy = math.cos(self.player_angle-1.57)*(PLAYER_SPEED*0.7), math.sin(self.player_angle-1.57)*(PLAYER_SPEED*0.7)
-        if keys[pygame.K_d]: dx, dy = math.cos(self.player_angle+1.57)*(PLAYER_SPEED*0.7), math.sin(self.player_angle+1.57)*(PLAYER_SPEED*0.7)
+        if keys[pygame.K_w]: dx, dy = math.cos(self.player_angle)*PLAYER_STEP, math.sin(self.player_angle)*PLAYER_STEP
+        if keys[pygame.K_s]: dx, dy = -math.cos(self.player_angle)*PLAYER_STEP, -math.sin(self.player_angle)*PLAYER_STEP
+        if keys[pygame.K_a]: dx, dy = math.cos(self.player_angle-1.57)*(PLAYER_STEP*0.7), math.sin(self.player_angle-1.57)*(PLAYER_STEP*0.7)
+        if keys[pygame.K_d]: dx, dy = math.cos(self.player_angle+1.57)*(PLAYER_STEP*0.7), math.sin(self.player_angle+1.57)*(PLAYER_STEP*0.7)
         if dx != 0 or dy != 0:
-            self.weapon_bob += 0.2
+            self.weapon_bob += WEAPON_BOB_STEP
             if not self.is_solid(int((self.player_x+dx+(1 if dx>0 else -1)*PLAYER_SIZE)/TILE_SIZE), int(self.player_y/TILE_SIZE)): self.player_x += dx
             if not self.is_solid(int(self.player_x/TILE_SIZE), int((self.player_y+dy+(1 if dy>0 else -1)*PLAYER_SIZE)/TILE_SIZE)): self.player_y += dy
         else: self.weapon_bob = 0.0
 
+    def set_tile(self, x, y, tile):
+        self.world_map[x, y] = tile
+        occupancy.update_block(self.occupancy, self.world_map, x, y)
+        self.map_version += 1
+
     def is_solid(self, x, y):
         if x < 0 or x >= self.map_size_x or y < 0 or y >= self.map_size_y: return True
         cell = self.world_map[x, y]
@@ -382,85 +441,211 @@ class Game:
         gy = int((self.player_y + math.sin(self.player_angle) * check_dist) / TILE_SIZE)
         
         if 0 <= gx < self.map_size_x and 0 <= gy < self.map_size_y:
-            cell = self.world_map[gx, gy]
-            if cell == 3 and self.door_lock[gx, gy] == 0: 
-                self.door_lock[gx, gy] = 1
-                self.world_map[gx, gy] = self.green_switch_id 
-                self.unlock_timers[(gx, gy)] = pygame.time.get_ticks() + 1000 
-            elif cell == 4 and self.door_state[gx, gy] < 0.1 and (gx, gy) not in self.unlock_timers: 
-                self.world_map[gx, gy] = self.green_switch_id 
-                self.unlock_timers[(gx, gy)] = pygame.time.get_ticks() + 1000 
+            self.doors.press(gx, gy, self.sim_ms)
+
+    # --- FIXED-STEP SIMULATION ---
+    def tick(self):
+        """Advances the game by one TICK_MS step; called 0..MAX_TICKS_PER_FRAME times per rendered frame."""
+        if self.state == "loading": self.update_loading(); return
+        if self.state != "game": return
+        self.sim_ms += TICK_MS
+        self.prev_x, self.prev_y = self.player_x, self.player_y
+        self.enemies.save_previous()
+        self.handle_movement(); self.handle_shooting()
+        self.update()
+
+    def interpolate(self, alpha):
+        """Render pose `alpha` of the way from the previous tick to the latest one (gameplay keeps reading player_x / enemies)."""
+        self.view_x = self.prev_x + (self.player_x - self.prev_x) * alpha
+        self.view_y = self.prev_y + (self.player_y - self.prev_y) * alpha
+        self.view_enemies = self.enemies.interpolated(alpha)
 
     def update(self):
         if self.state != "game": return
-        now = pygame.time.get_ticks()
+        now = self.sim_ms
 
         # --- WIN CONDITION: Progress North ---
         if self.player_y < 1.5 * TILE_SIZE:
             self.state = "level_complete"
             pygame.mouse.set_visible(True); pygame.event.set_grab(False)
         
-        for p in self.pickups:
-            if not p['collected'] and math.hypot(self.player_x - p['x'], self.player_y - p['y']) < 75:
-                if p['type'] == 'health' and self.health < MAX_HEALTH: self.health = min(MAX_HEALTH, self.health + 25); p['collected'] = True
-                elif p['type'] == 'ammo' and self.ammo < MAX_AMMO: self.ammo = min(MAX_AMMO, self.ammo + 20); p['collected'] = True
-                elif p['type'] == 'armor' and self.armor < 100: self.armor = min(100, self.armor + 25); p['collected'] = True
-        
-        # Door automation
-        for k in [k for k, t in self.unlock_timers.items() if now >= t]: self.active_doors[k], _ = 'opening', self.unlock_timers.pop(k)
-        fin = []
-        for k, s in self.active_doors.items():
-            if s == 'opening': 
-                self.door_state[k] += 0.03
-                if self.door_state[k] >= 1.0: self.door_state[k], self.active_doors[k], self.open_timers[k] = 1.0, 'open', now + 5000
-            elif s == 'closing': 
-                self.door_state[k] -= 0.03
-                if self.door_state[k] <= 0.0: 
-                    self.door_state[k] = 0.0
-                    fin.append(k)
-                    if self.door_lock[k[0], k[1]] == 1: self.world_map[k[0], k[1]], self.door_lock[k[0], k[1]] = 3, 0
-                    else: self.world_map[k[0], k[1]] = 4 
-                        
-        for k in fin: del self.active_doors[k]
-        for k in [k for k, t in self.open_timers.items() if now >= t and math.hypot(self.player_x-(k[0]+0.5)*TILE_SIZE, self.player_y-(k[1]+0.5)*TILE_SIZE) > TILE_SIZE]: self.active_doors[k], _ = 'closing', self.open_timers.pop(k)
-        
+        with self.profiler.scope("pickups"): self.update_pickups()
+        with self.profiler.scope("doors"): self.update_doors(now)
+        with self.profiler.scope("enemies"): self.update_enemies()
+        with self.profiler.scope("timers"): self.update_timers()
+
+    def update_loading(self):
+        if self.loading_phase == 0:
+            self.loading_alpha += self.fade_speed
+            if self.loading_alpha >= 255: self.loading_alpha, self.loading_phase, self.loading_timer = 255, 1, pygame.time.get_ticks()
+        elif self.loading_phase == 1 and pygame.time.get_ticks() - self.loading_timer > 2000: self.loading_phase = 2
+        elif self.loading_phase == 2:
+            self.loading_alpha -= self.fade_speed
+            if self.loading_alpha <= 0: 
+                self.warmup_thread.join() # Never hitch the first gameplay frame on JIT
+                self.reset_game_data()
+                self.state = "game"
+                pygame.mouse.set_visible(False)
+                pygame.event.set_grab(True)
+
+    def update_pickups(self):
+        self.health, self.ammo, self.armor = self.pickups.collect(self.player_x, self.player_y, self.health, self.ammo, self.armor)
+
+    def update_doors(self, now):
+        # Door automation (event-driven, see doors.py)
+        self.doors.update(now, self.player_x, self.player_y)
+
         gx, gy = int((self.player_x+math.cos(self.player_angle)*TILE_SIZE*1.0)/TILE_SIZE), int((self.player_y+math.sin(self.player_angle)*TILE_SIZE*1.0)/TILE_SIZE)
         if 0 <= gx < self.map_size_x and 0 <= gy < self.map_size_y: self.player_facing_door = (self.world_map[gx, gy] in [3, 4]) and self.door_state[gx, gy] < 0.1
         else: self.player_facing_door = False
 
-        for e in self.enemies:
-            if e['health'] <= 0: continue
-            e['anim_timer'] += 1
-            if e['anim_timer'] > 20: e['anim_timer'], e['frame'] = 0, 1 - e['frame']
-            d = math.hypot(self.player_x - e['x'], self.player_y - e['y'])
-            if d > 40:
-                nx, ny = (self.player_x-e['x'])/d, (self.player_y-e['y'])/d
-                if self.world_map[int((e['x']+nx*ENEMY_SPEED)//TILE_SIZE), int(e['y']//TILE_SIZE)] == 0: e['x'] += nx*ENEMY_SPEED
-                if self.world_map[int(e['x']//TILE_SIZE), int((e['y']+ny*ENEMY_SPEED)//TILE_SIZE)] == 0: e['y'] += ny*ENEMY_SPEED
-            else:
-                self.health -= ENEMY_DAMAGE; self.damage_flash, self.screen_shake = 120, 15
-                if self.health <= 0: self.state = "game_over"
+    def update_enemies(self):
+        self.flow_field.update(self.world_map, self.door_state, self.player_x, self.player_y, self.doors.passable_version)
+        contacts = self.enemies.update(self.player_x, self.player_y, self.world_map, self.door_state, self.flow_field)
+        if contacts:
+            self.health -= contacts * ENEMY_DAMAGE_STEP; self.damage_flash, self.screen_shake = 120, 15
+            if self.health <= 0:
+                self.state = "game_over"
+                self.prefetcher.request(self.current_level) # SPACE restarts this level
 
+    def update_timers(self):
         if self.is_reloading: 
             self.reload_timer -= 1
             if self.reload_timer <= 0: self.is_reloading, self.ammo = False, MAX_AMMO
-        self.damage_flash, self.screen_shake = max(0, self.damage_flash-5), self.screen_shake*0.9 if self.screen_shake > 1 else 0
-        self.weapon_recoil, self.muzzle_timer = max(0, self.weapon_recoil-2), max(0, self.muzzle_timer-1)
+        self.damage_flash, self.screen_shake = max(0, self.damage_flash-DAMAGE_FLASH_FADE_STEP), self.screen_shake*SCREEN_SHAKE_DECAY_STEP if self.screen_shake > 1 else 0
+        self.weapon_recoil, self.muzzle_timer = max(0, self.weapon_recoil-RECOIL_RECOVERY_STEP), max(0, self.muzzle_timer-1)
+        for t in self.tracers: t['life'] -= 1
+        self.tracers = [t for t in self.tracers if t['life'] > 0]
         self.face_timer -= 1
         if self.face_timer <= 0:
-            if self.face_state == 'center': self.face_state, self.face_timer = random.choice(['left', 'right']), FACE_LOOK_TIME
-            else: self.face_state, self.face_timer = 'center', random.randint(FACE_IDLE_MIN, FACE_IDLE_MAX)
+            if self.face_state == 'center': self.face_state, self.face_timer = random.choice(['left', 'right']), FACE_LOOK_TICKS
+            else: self.face_state, self.face_timer = 'center', random.randint(FACE_IDLE_MIN_TICKS, FACE_IDLE_MAX_TICKS)
 
     def fire_weapon(self):
-        now = pygame.time.get_ticks()
+        now = self.sim_ms
         if self.is_reloading or self.ammo <= 0 or now - self.last_shot < FIRE_RATE: return
-        self.last_shot, self.ammo, self.weapon_recoil, self.screen_shake, self.muzzle_timer = now, self.ammo - 1, RECOIL_FORCE, 10.0, 5
+        self.last_shot, self.ammo, self.weapon_recoil, self.screen_shake, self.muzzle_timer = now, self.ammo - 1, RECOIL_FORCE, 10.0, MUZZLE_FLASH_TICKS
         self.player_pitch += 10.0
-        self.tracers.append({'x': SCREEN_WIDTH//2 + random.randint(-10, 10), 'y': HALF_HEIGHT + random.randint(-10, 10), 'life': 5})
+        angles = hitscan.spread(self.player_angle)
+        hitscan.fire(self.enemies, self.world_map, self.door_state, self.player_x, self.player_y, angles)
+        for a in angles: # One tracer per pellet, at the pellet's screen column
+            tx = SCREEN_WIDTH//2 + int(math.tan(a - self.player_angle) * SCREEN_WIDTH * raycaster.FOCAL_LENGTH)
+            self.tracers.append({'x': tx + random.randint(-10, 10), 'y': HALF_HEIGHT + random.randint(-10, 10), 'life': TRACER_TICKS})
+
+    # --- GAMEPLAY FRAME STAGES ---
+    def render_world(self):
+        # Render World (into the top-left rw x rh corner when dynamic resolution kicks in)
+        rw, rh = self.resolution.size
+        self.render_kernel(self.view_x, self.view_y, self.player_angle, self.player_pitch, self.world_map, self.occupancy, self.door_state, self.door_lock, self.door_dir, self.wall_textures, self.floor_texture, self.ceil_texture, self.floor_ao, self.row_shade, raycaster.ray_table(rw), self.screen_buffer[:rw, :rh], self.depth_buffer)
+        return rw, rh
+
+    def present_world(self, rw, rh):
+        sx, sy = (random.randint(-int(self.screen_shake), int(self.screen_shake)), random.randint(-int(self.screen_shake), int(self.screen_shake))) if self.screen_shake > 0 else (0,0)
+        if rw == SCREEN_WIDTH and rh == SCREEN_HEIGHT: self.screen.blit(self.frame_surface, (sx, sy))
+        else:
+            pygame.transform.scale(self.frame_surface.subsurface((0, 0, rw, rh)), (SCREEN_WIDTH, SCREEN_HEIGHT), self.upscale_surface)
+            self.screen.blit(self.upscale_surface, (sx, sy))
+        return sx, sy
+
+    def render_sprites(self, rw, rh):
+        # Jitted sprite pass: writes clipped, per-column depth-tested texels straight into the frame buffer
+        raycaster.sprite_pass(self.view_x, self.view_y, self.player_angle, self.player_pitch, self.sprite_rows(), self.assets.sprite_textures, self.screen_buffer[:rw, :rh], self.depth_buffer)
+
+    def sprite_rows(self):
+        """(N, 6) rows for raycaster.sprite_pass: every live enemy at its interpolated spot, then every pickup."""
+        ids, aspect = self.assets.sprite_ids, self.assets.sprite_aspect
+        e, p = self.enemies, self.pickups
+        alive, active = e.alive(), p.active()
+        frame, kind = e.frame[alive], p.kind[active]
+        n = len(frame)
+        sprites = np.empty((n + len(kind), 6), dtype=np.float64)
+        sprites[:n, 0], sprites[:n, 1] = self.view_enemies[0][alive], self.view_enemies[1][alive]
+        sprites[:n, 2] = np.array([ids['enemy0'], ids['enemy1']])[frame]
+        sprites[:n, 3] = 0.7 * np.array([aspect['enemy0'], aspect['enemy1']])[frame]
+        sprites[:n, 4], sprites[:n, 5] = 0.7, 0
+        sprites[n:, 0], sprites[n:, 1] = p.x[active], p.y[active]
+        sprites[n:, 2] = np.array([ids[f"{t}_pickup"] for t in entities.PICKUP_TYPES])[kind]
+        sprites[n:, 3:5], sprites[n:, 5] = 0.4, 1
+        return sprites
+
+    def draw_sprites(self, rw, sx, sy):
+        # Legacy Surface path (SPRITE_KERNEL = False)
         pc, ps = math.cos(self.player_angle), math.sin(self.player_angle)
-        for e in self.enemies:
-            if e['health'] > 0 and (e['x']-self.player_x)*pc + (e['y']-self.player_y)*ps > 0 and abs((e['y']-self.player_y)*pc - (e['x']-self.player_x)*ps) < 30:
-                e['health'] -= 20; e['hit_timer'] = 5; return
+        e, p = self.enemies, self.pickups
+        ex, ey = self.view_enemies
+        to_draw = []
+        for i in np.flatnonzero(e.alive()):
+            d = (ex[i]-self.view_x)*pc + (ey[i]-self.view_y)*ps
+            if d > 10: to_draw.append((d, ex[i], ey[i], f"enemy{e.frame[i]}"))
+        for i in np.flatnonzero(p.active()):
+            d = (p.x[i]-self.view_x)*pc + (p.y[i]-self.view_y)*ps
+            if d > 10: to_draw.append((d, p.x[i], p.y[i], f"{entities.PICKUP_TYPES[p.kind[i]]}_pickup"))
+        
+        to_draw.sort(key=lambda x: x[0], reverse=True)
+        for depth, ox, oy, name in to_draw:
+            lat = (oy-self.view_y)*pc - (ox-self.view_x)*ps
+            scale = SCREEN_HEIGHT / (depth / TILE_SIZE)
+            scx, scy = int(SCREEN_WIDTH/2+(lat/depth)*SCREEN_WIDTH*raycaster.FOCAL_LENGTH), int(HALF_HEIGHT+self.player_pitch+(0.5*SCREEN_HEIGHT/(depth/TILE_SIZE)))
+            if 0 <= scx < SCREEN_WIDTH and depth/TILE_SIZE < self.depth_buffer[scx * rw // SCREEN_WIDTH] + 0.3:
+                if name.startswith('enemy'):
+                    spr = self.assets.scaled_sprite(name, int(scale*0.7*self.assets.sprite_aspect[name]), int(scale*0.7))
+                    self.screen.blit(spr, (scx-spr.get_width()//2+sx, scy-spr.get_height()+sy))
+                
+                # --- SPRITE PICKUP RENDERING ---
+                else:
+                    pw = int(scale * 0.4)
+                    spr = self.assets.scaled_sprite(name, pw, pw)
+                    self.screen.blit(spr, (scx - spr.get_width()//2 + sx, scy - spr.get_height()//2 + sy))
+
+    def post_effects(self):
+        """This frame's descriptor rows for postfx: the POSTFX_* look, then the damage flash."""
+        fx = self.effects; fx.clear()
+        if POSTFX_BRIGHTNESS != 1.0 or POSTFX_GAMMA != 1.0: fx.grade(POSTFX_BRIGHTNESS, POSTFX_GAMMA)
+        if POSTFX_VIGNETTE > 0: fx.vignette(POSTFX_VIGNETTE, POSTFX_VIGNETTE_RADIUS)
+        if self.damage_flash > 0: fx.tint((255, 0, 0), int(self.damage_flash) / 255)
+        if POSTFX_RETRO_LEVELS > 1: fx.retro(POSTFX_RETRO_LEVELS)
+        return fx.active()
+
+    def post_process(self, rw, rh):
+        fx = self.post_effects()
+        if len(fx): self.postfx_kernel(self.screen_buffer[:rw, :rh], fx) # No effects, no pass
+
+    def draw_hud(self, sx, sy):
+        gun = self.assets.images['gun_fire'] if self.muzzle_timer > 0 else self.assets.images['gun_default']
+        roff = math.sin((1-self.reload_timer/RELOAD_TICKS)*math.pi)*200 if self.is_reloading else 0
+        gx = (SCREEN_WIDTH//2) - (gun.get_width()//2) + 180 + math.cos(self.weapon_bob)*10 + sx
+        gy = SCREEN_HEIGHT - gun.get_height() + 40 + abs(math.sin(self.weapon_bob))*10 + self.weapon_recoil + sy + roff
+        self.screen.blit(gun, (gx, gy))
+        
+        for t in self.tracers:
+            pygame.draw.line(self.screen, (255,255,0), (gx + gun.get_width() * 0.3, gy + gun.get_height() * 0.2), (t['x']+sx, t['y']+sy), 2)
+
+        self.status_bar.update(self.ammo, self.health, self.armor, self.face_state)
+        self.status_bar.draw(self.screen)
+        pygame.draw.line(self.screen, DOOM_BEVEL_LIGHT, (0, SCREEN_HEIGHT-HUD_HEIGHT), (SCREEN_WIDTH, SCREEN_HEIGHT-HUD_HEIGHT), 3)
+
+        # Draw Interaction Text
+        if self.player_facing_door and self.state == "game":
+            itxt = self.text_cache.render(self.custom_ui_font_small, "Press E to Open", (255, 255, 255))
+            self.screen.blit(itxt, (SCREEN_WIDTH//2 - itxt.get_width()//2, HALF_HEIGHT + 60))
+
+        # Render Crosshair
+        if self.state == "game":
+            c = self.crosshair_colors[self.crosshair_idx][0]
+            cx, cy, g, l = SCREEN_WIDTH//2, HALF_HEIGHT, 6, 12
+            pygame.draw.line(self.screen, c, (cx, cy-g-l), (cx, cy-g), 2); pygame.draw.line(self.screen, c, (cx, cy+g), (cx, cy+g+l), 2)
+            pygame.draw.line(self.screen, c, (cx-g-l, cy), (cx-g, cy), 2); pygame.draw.line(self.screen, c, (cx+g, cy), (cx+g+l, cy), 2)
+            
+            # Render FPS if enabled
+            if self.show_fps:
+                fps_txt = self.text_cache.render(self.custom_ui_font_small, f"FPS: {int(self.clock.get_fps())}", (0, 255, 0))
+                self.screen.blit(fps_txt, (SCREEN_WIDTH - 100, 20))
+
+        # Draw Compass
+        if self.state == "game":
+            dir_text = self.get_compass_direction()
+            compass_surf = self.text_cache.render(self.compass_font, dir_text, (245, 245, 220))
+            self.screen.blit(compass_surf, (25, 25))
 
     # --- RENDERING ---
     def draw(self):
@@ -470,15 +655,15 @@ class Game:
             self.screen.blit(self.assets.images['menu_logo'], ((SCREEN_WIDTH-self.assets.images['menu_logo'].get_width())//2, SCREEN_HEIGHT-80-self.assets.images['menu_logo'].get_height()))
             for i, txt in enumerate(self.menu_options):
                 color = MENU_TEXT_HOVER if i == self.menu_selected else MENU_TEXT_COLOR
-                surf = self.custom_ui_font.render(txt, True, color)
+                surf = self.text_cache.render(self.custom_ui_font, txt, color)
                 self.screen.blit(surf, (SCREEN_WIDTH*(0.25+i*0.25)-surf.get_width()//2, SCREEN_HEIGHT-55))
         
         elif self.state in ["profile_action_menu", "profile_select", "profile_create"]:
             self.screen.blit(self.assets.images['menu_bg'], (0,0))
-            ov = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); ov.fill((0,0,0)); ov.set_alpha(150); self.screen.blit(ov, (0,0))
+            self.overlays.tint(self.screen, (0,0,0), 150)
             
             if self.state == "profile_action_menu":
-                ts = self.assets.fonts['death'].render("PROFILES", True, DOOM_GOLD)
+                ts = self.text_cache.render(self.assets.fonts['death'], "PROFILES", DOOM_GOLD)
                 self.screen.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 80))
                 for i, txt in enumerate(self.profile_action_options):
                     # Gray out CONTINUE and DELETE if no profiles exist
@@ -486,12 +671,12 @@ class Game:
                         color = (100, 100, 100) 
                     else:
                         color = MENU_TEXT_HOVER if i == self.profile_action_selected else (160, 160, 160)
-                    surf = self.custom_ui_font.render(f">  {txt}  <" if i == self.profile_action_selected else txt, True, color)
+                    surf = self.text_cache.render(self.custom_ui_font, f">  {txt}  <" if i == self.profile_action_selected else txt, color)
                     self.screen.blit(surf, (SCREEN_WIDTH//2 - surf.get_width()//2, 220 + i * 60))
             
             elif self.state == "profile_select":
                 title = "SELECT PROFILE" if self.profile_list_mode == "continue" else "DELETE PROFILE"
-                ts = self.assets.fonts['death'].render(title, True, DOOM_GOLD if self.profile_list_mode == "continue" else DOOM_RED)
+                ts = self.text_cache.render(self.assets.fonts['death'], title, DOOM_GOLD if self.profile_list_mode == "continue" else DOOM_RED)
                 self.screen.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 80))
                 
                 profiles_list = list(self.profiles.keys())
@@ -500,134 +685,52 @@ class Game:
                     p_data = self.profiles[name]
                     txt = f"{name} - LVL {p_data['level']+1}"
                     txt = f">  {txt}  <" if i == self.profile_list_selected else txt
-                    surf = self.custom_ui_font.render(txt, True, color)
+                    surf = self.text_cache.render(self.custom_ui_font, txt, color)
                     self.screen.blit(surf, (SCREEN_WIDTH//2 - surf.get_width()//2, 220 + i * 50))
             
             elif self.state == "profile_create":
-                ts = self.assets.fonts['death'].render("NEW PROFILE", True, DOOM_GOLD)
+                ts = self.text_cache.render(self.assets.fonts['death'], "NEW PROFILE", DOOM_GOLD)
                 self.screen.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 80))
-                prompt = self.custom_ui_font.render("ENTER NAME:", True, (200, 200, 200))
+                prompt = self.text_cache.render(self.custom_ui_font, "ENTER NAME:", (200, 200, 200))
                 self.screen.blit(prompt, (SCREEN_WIDTH//2 - prompt.get_width()//2, 250))
                 
                 # Blinking cursor effect
                 cursor = "_" if pygame.time.get_ticks() % 1000 < 500 else ""
-                name_surf = self.custom_ui_font.render(self.typing_name + cursor, True, DOOM_RED)
+                name_surf = self.text_cache.render(self.custom_ui_font, self.typing_name + cursor, DOOM_RED)
                 self.screen.blit(name_surf, (SCREEN_WIDTH//2 - name_surf.get_width()//2, 320))
 
         elif self.state == "loading":
-            self.screen.fill((0,0,0)); img = self.assets.images['loading'].copy(); img.set_alpha(int(self.loading_alpha)); self.screen.blit(img, (0,0))
-            if self.loading_phase == 0:
-                self.loading_alpha += self.fade_speed
-                if self.loading_alpha >= 255: self.loading_alpha, self.loading_phase, self.loading_timer = 255, 1, pygame.time.get_ticks()
-            elif self.loading_phase == 1 and pygame.time.get_ticks() - self.loading_timer > 2000: self.loading_phase = 2
-            elif self.loading_phase == 2:
-                self.loading_alpha -= self.fade_speed
-                if self.loading_alpha <= 0: 
-                    self.reset_game_data()
-                    self.state = "game"
-                    pygame.mouse.set_visible(False)
-                    pygame.event.set_grab(True)
+            self.screen.fill((0,0,0)); self.loading_fade.draw(self.screen, int(self.loading_alpha))
         
         elif self.state in ["game", "paused", "game_over", "level_complete", "options", "controls"]:
-            # Render World
-            raycaster.render_kernel(self.player_x, self.player_y, self.player_angle, self.player_pitch, self.world_map, self.door_state, self.door_lock, self.door_dir, self.assets.wall_textures, self.assets.floor_texture, self.assets.ceil_texture, self.screen_buffer, self.depth_buffer)
-            sx, sy = (random.randint(-int(self.screen_shake), int(self.screen_shake)), random.randint(-int(self.screen_shake), int(self.screen_shake))) if self.screen_shake > 0 else (0,0)
-            self.screen.blit(pygame.surfarray.make_surface(self.screen_buffer), (sx, sy))
-            
-            # Draw Compass
-            if self.state == "game":
-                dir_text = self.get_compass_direction()
-                compass_surf = self.compass_font.render(dir_text, True, (245, 245, 220))
-                self.screen.blit(compass_surf, (25, 25))
-
-            pc, ps = math.cos(self.player_angle), math.sin(self.player_angle)
-            to_draw = []
-            for e in self.enemies:
-                if e['health'] > 0:
-                    d = (e['x']-self.player_x)*pc + (e['y']-self.player_y)*ps
-                    if d > 10: to_draw.append((d, e, 'enemy'))
-            for p in self.pickups:
-                if not p['collected']:
-                    d = (p['x']-self.player_x)*pc + (p['y']-self.player_y)*ps
-                    if d > 10: to_draw.append((d, p, 'pickup'))
-            
-            to_draw.sort(key=lambda x: x[0], reverse=True)
-            for depth, obj, st in to_draw:
-                lat = (obj['y']-self.player_y)*pc - (obj['x']-self.player_x)*ps
-                scale = SCREEN_HEIGHT / (depth / TILE_SIZE)
-                scx, scy = int(SCREEN_WIDTH/2+(lat/depth)*(SCREEN_WIDTH/2/math.tan(HALF_FOV))), int(HALF_HEIGHT+self.player_pitch+(0.5*SCREEN_HEIGHT/(depth/TILE_SIZE)))
-                if 0 <= scx < SCREEN_WIDTH and depth/TILE_SIZE < self.depth_buffer[scx] + 0.3:
-                    if st == 'enemy':
-                        tex = self.assets.enemy_frames[obj['frame']]
-                        sw, sh = int(scale*0.7*(tex.get_width()/tex.get_height())), int(scale*0.7)
-                        self.screen.blit(pygame.transform.scale(tex, (sw, sh)), (scx-sw//2+sx, scy-sh+sy))
-                    
-                    # --- SPRITE PICKUP RENDERING ---
-                    else:
-                        sprite = self.assets.images[f"{obj['type']}_pickup"]
-                        pw, ph = int(scale * 0.4), int(scale * 0.4)
-                        self.screen.blit(pygame.transform.scale(sprite, (pw, ph)), (scx - pw//2 + sx, scy - ph//2 + sy))
-
-            if self.damage_flash > 0:
-                f = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); f.fill((255,0,0)); f.set_alpha(int(self.damage_flash)); self.screen.blit(f, (0,0))
-
-            gun = self.assets.images['gun_fire'] if self.muzzle_timer > 0 else self.assets.images['gun_default']
-            roff = math.sin((1-self.reload_timer/60)*math.pi)*200 if self.is_reloading else 0
-            gx = (SCREEN_WIDTH//2) - (gun.get_width()//2) + 180 + math.cos(self.weapon_bob)*10 + sx
-            gy = SCREEN_HEIGHT - gun.get_height() + 40 + abs(math.sin(self.weapon_bob))*10 + self.weapon_recoil + sy + roff
-            self.screen.blit(gun, (gx, gy))
-            
-            for t in self.tracers:
-                pygame.draw.line(self.screen, (255,255,0), (gx + gun.get_width() * 0.3, gy + gun.get_height() * 0.2), (t['x']+sx, t['y']+sy), 2)
-                t['life'] -= 1
-            self.tracers = [t for t in self.tracers if t['life'] > 0]
-
-            self.screen.blit(self.assets.images['hud_bg'], (0, SCREEN_HEIGHT-HUD_HEIGHT))
-            pygame.draw.line(self.screen, DOOM_BEVEL_LIGHT, (0, SCREEN_HEIGHT-HUD_HEIGHT), (SCREEN_WIDTH, SCREEN_HEIGHT-HUD_HEIGHT), 3)
-            
-            def db(x, l, v, p=False):
-                r = pygame.Rect(x, SCREEN_HEIGHT-HUD_HEIGHT+15, 100, HUD_HEIGHT-30)
-                pygame.draw.rect(self.screen, DOOM_BEVEL_DARK, r); pygame.draw.rect(self.screen, DOOM_BEVEL_LIGHT, r, 2)
-                ls = self.custom_ui_font_small.render(l, True, DOOM_GOLD); self.screen.blit(ls, (r.x+(r.w-ls.get_width())//2, r.y+4))
-                vs = self.custom_ui_font.render(f"{int(v)}{'%' if p else ''}", True, DOOM_RED); self.screen.blit(vs, (r.x+(r.w-vs.get_width())//2, r.y+18))
-
-            db(20, "AMMO", self.ammo); db(140, "HEALTH", self.health, True); db(SCREEN_WIDTH-260, "ARMOR", self.armor, True)
-            fr = pygame.Rect(SCREEN_WIDTH//2-40, SCREEN_HEIGHT-HUD_HEIGHT+10, 80, 80); pygame.draw.rect(self.screen, (0,0,0), fr)
-            self.screen.blit(self.assets.faces[self.face_state], (fr.x+8, fr.y+8)); pygame.draw.rect(self.screen, DOOM_BEVEL_LIGHT, fr, 3)
-
-            # Draw Interaction Text
-            if self.player_facing_door and self.state == "game":
-                itxt = self.custom_ui_font_small.render("Press E to Open", True, (255, 255, 255))
-                self.screen.blit(itxt, (SCREEN_WIDTH//2 - itxt.get_width()//2, HALF_HEIGHT + 60))
-
-            # Render Crosshair
-            if self.state == "game":
-                c = self.crosshair_colors[self.crosshair_idx][0]
-                cx, cy, g, l = SCREEN_WIDTH//2, HALF_HEIGHT, 6, 12
-                pygame.draw.line(self.screen, c, (cx, cy-g-l), (cx, cy-g), 2); pygame.draw.line(self.screen, c, (cx, cy+g), (cx, cy+g+l), 2)
-                pygame.draw.line(self.screen, c, (cx-g-l, cy), (cx-g, cy), 2); pygame.draw.line(self.screen, c, (cx+g, cy), (cx+g+l, cy), 2)
-                
-                # Render FPS if enabled
-                if self.show_fps:
-                    fps_txt = self.custom_ui_font_small.render(f"FPS: {int(self.clock.get_fps())}", True, (0, 255, 0))
-                    self.screen.blit(fps_txt, (SCREEN_WIDTH - 100, 20))
+            if self.pipeline:
+                with self.profiler.scope("render wait"): rw, rh = self.pipeline.next_frame() # Shows the previous frame
+            else:
+                with self.profiler.scope("kernel"): rw, rh = self.render_world()
+                if self.sprite_kernel:
+                    with self.profiler.scope("sprites"): self.render_sprites(rw, rh)
+                with self.profiler.scope("postfx"): self.post_process(rw, rh)
+            with self.profiler.scope("present"): sx, sy = self.present_world(rw, rh)
+            if not self.sprite_kernel:
+                with self.profiler.scope("sprites"): self.draw_sprites(rw, sx, sy)
+            with self.profiler.scope("hud"): self.draw_hud(sx, sy)
 
             # Overlays
             if self.state in ["paused", "options", "controls"]:
-                ov = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); ov.set_alpha(200); ov.fill((10, 5, 5)); self.screen.blit(ov, (0,0))
+                self.overlays.tint(self.screen, (10, 5, 5), 200)
                 
                 if self.state == "paused":
-                    ps = self.assets.fonts['death'].render("PAUSED", True, DOOM_RED)
+                    ps = self.text_cache.render(self.assets.fonts['death'], "PAUSED", DOOM_RED)
                     self.screen.blit(ps, (SCREEN_WIDTH//2 - ps.get_width()//2, 80))
                     for i, opt in enumerate(self.pause_options):
                         is_s = (i == self.pause_selected)
                         clr = MENU_TEXT_HOVER if is_s else (160, 160, 160)
                         txt = f">  {opt}  <" if is_s else opt
-                        os = self.custom_ui_font.render(txt, True, clr) 
+                        os = self.text_cache.render(self.custom_ui_font, txt, clr) 
                         self.screen.blit(os, (SCREEN_WIDTH//2 - os.get_width()//2, 220 + i * 50))
                 
                 elif self.state == "options":
-                    ts = self.assets.fonts['death'].render("OPTIONS", True, DOOM_GOLD)
+                    ts = self.text_cache.render(self.assets.fonts['death'], "OPTIONS", DOOM_GOLD)
                     self.screen.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 60))
                     
                     for i, opt in enumerate(self.options_menu):
@@ -639,40 +742,61 @@ class Game:
                         if i == 0: display_text += f" < {round(self.mouse_sens, 4)} >"
                         elif i == 1: display_text += f" < {self.crosshair_colors[self.crosshair_idx][1]} >"
                         elif i == 2: display_text += f" < {'ON' if self.show_fps else 'OFF'} >"
+                        elif i == 3: display_text += f" < {int(self.resolution.scale * 100)}% >" if self.resolution.enabled else " < OFF >"
                         
                         txt = f">  {display_text}  <" if is_s else display_text
-                        os = self.custom_ui_font.render(txt, True, clr) 
+                        os = self.text_cache.render(self.custom_ui_font, txt, clr) 
                         self.screen.blit(os, (SCREEN_WIDTH//2 - os.get_width()//2, 180 + i * 60))
 
                 elif self.state == "controls":
-                    ts = self.assets.fonts['death'].render("CONTROLS", True, DOOM_GOLD)
+                    ts = self.text_cache.render(self.assets.fonts['death'], "CONTROLS", DOOM_GOLD)
                     self.screen.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 60))
                     for i, line in enumerate(self.controls_text):
-                        cs = self.custom_ui_font.render(line, True, (200, 200, 200))
+                        cs = self.text_cache.render(self.custom_ui_font, line, (200, 200, 200))
                         self.screen.blit(cs, (SCREEN_WIDTH//2 - cs.get_width()//2, 160 + i * 45))
-                    bs = self.custom_ui_font_small.render("Press SPACE or ESC to return", True, MENU_TEXT_HOVER)
+                    bs = self.text_cache.render(self.custom_ui_font_small, "Press SPACE or ESC to return", MENU_TEXT_HOVER)
                     self.screen.blit(bs, (SCREEN_WIDTH//2 - bs.get_width()//2, SCREEN_HEIGHT - 100))
 
             if self.state == "game_over":
-                ov = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); ov.fill((0,0,0)); ov.set_alpha(180); self.screen.blit(ov, (0,0))
-                ds = self.assets.fonts['death'].render("YOU DIED", True, (150,0,0)); self.screen.blit(ds, (SCREEN_WIDTH//2-ds.get_width()//2, HALF_HEIGHT-50))
-                rs = self.assets.fonts['restart'].render("Press SPACE to Restart", True, (200,200,200)); self.screen.blit(rs, (SCREEN_WIDTH//2-rs.get_width()//2, HALF_HEIGHT+50))
+                self.overlays.tint(self.screen, (0,0,0), 180)
+                ds = self.text_cache.render(self.assets.fonts['death'], "YOU DIED", (150,0,0)); self.screen.blit(ds, (SCREEN_WIDTH//2-ds.get_width()//2, HALF_HEIGHT-50))
+                rs = self.text_cache.render(self.assets.fonts['restart'], "Press SPACE to Restart", (200,200,200)); self.screen.blit(rs, (SCREEN_WIDTH//2-rs.get_width()//2, HALF_HEIGHT+50))
 
             if self.state == "level_complete":
-                ov = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); ov.fill((0,0,0)); ov.set_alpha(180); self.screen.blit(ov, (0,0))
-                ds = self.custom_ui_font.render("MISSION ACCOMPLISHED", True, (0, 255, 100))
+                self.overlays.tint(self.screen, (0,0,0), 180)
+                ds = self.text_cache.render(self.custom_ui_font, "MISSION ACCOMPLISHED", (0, 255, 100))
                 self.screen.blit(ds, (SCREEN_WIDTH//2-ds.get_width()//2, HALF_HEIGHT-50))
                 
                 # Check if there are more levels to change the spacebar text
                 msg = "Press SPACE to Continue" if self.current_level < len(levels.LEVELS) - 1 else "Press SPACE to Finish"
-                rs = self.custom_ui_font_small.render(msg, True, (200,200,200))
+                rs = self.text_cache.render(self.custom_ui_font_small, msg, (200,200,200))
                 self.screen.blit(rs, (SCREEN_WIDTH//2-rs.get_width()//2, HALF_HEIGHT+50))
 
-        pygame.display.flip()
+            if self.profiler.enabled: self.profiler.draw_overlay(self.screen, self.assets.fonts['fps'])
+
+        with self.profiler.scope("flip"): pygame.display.flip()
 
     def run(self):
-        while self.check_input(): self.update(); self.draw(); self.clock.tick(FPS)
+        # Fixed timestep: wall time accumulates in `lag` and is spent in whole ticks; what's left over
+        # blends the view between the last two ticks, so rendering can run at any rate (FPS = 0 for uncapped)
+        lag, last = 0.0, time.perf_counter()
+        while True:
+            self.profiler.begin_frame()
+            with self.profiler.scope("input"):
+                if not self.check_input(): break
+            now = time.perf_counter()
+            lag, last = min(lag + (now - last) * 1000.0, MAX_TICKS_PER_FRAME * TICK_MS), now
+            while lag >= TICK_MS: self.tick(); lag -= TICK_MS
+            self.interpolate(lag / TICK_MS)
+            self.draw()
+            with self.profiler.scope("tick"): self.clock.tick(FPS)
+            if self.state == "game": self.resolution.update(self.clock.get_rawtime())
+            self.profiler.end_frame()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = Game(); game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=GAME_TITLE)
+    parser.add_argument("--dynamic-res", action=argparse.BooleanOptionalAction, default=DYNAMIC_RES, help="scale the render resolution to hold the frame budget")
+    parser.add_argument("--pipelined", action=argparse.BooleanOptionalAction, default=PIPELINED_RENDER, help="render on a worker thread one frame behind the simulation")
+    args = parser.parse_args()
+    game = Game(dynamic_res=args.dynamic_res, pipelined=args.pipelined); game.run()
\ No newline at end of file
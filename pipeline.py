@@ -0,0 +1,96 @@
+import queue
+import threading
+import numpy as np
+import pygame
+from settings import *
+import raycaster
+
+# --- PIPELINED RENDERING ---
+# The main thread simulates and captures frame N+1 while a worker thread runs
+# the (GIL-free) kernels on frame N. Two snapshots and two frame buffers take
+# turns, so neither thread ever reads what the other is writing; the main
+# thread only presents whichever frame the worker finished last.
+
+class Snapshot:
+    """Everything the render worker reads for one frame, copied out of the live game state.
+
+    The map arrays are only re-copied when the game's map_version moved since
+    this snapshot last took them, and while doors slide only the door tiles'
+    door_state is, so a frame copies nothing from the map unless a tile changed.
+    """
+    def __init__(self):
+        self.world_map = self.occupancy = self.door_state = None
+        self.map_key = self.doors_key = None # (map_version) / (doors, version) the copies were taken at
+        self.pose, self.size, self.sprites, self.effects = None, None, None, None
+
+    def capture(self, game):
+        if self.world_map is None or self.world_map.shape != game.world_map.shape:
+            self.world_map, self.occupancy, self.door_state = game.world_map.copy(), game.occupancy.copy(), game.door_state.copy()
+        else:
+            if self.map_key != game.map_version: np.copyto(self.world_map, game.world_map); np.copyto(self.occupancy, game.occupancy); np.copyto(self.door_state, game.door_state)
+            elif self.doors_key != (game.doors, game.doors.version): cells = game.doors.cells; self.door_state[cells] = game.door_state[cells]
+        self.map_key, self.doors_key = game.map_version, (game.doors, game.doors.version)
+        self.pose = (game.view_x, game.view_y, game.player_angle, game.player_pitch)
+        self.size = game.resolution.size
+        self.sprites = game.sprite_rows() if game.sprite_kernel else None
+        self.effects = game.post_effects().copy()
+
+class FrameBuffer:
+    """A frame the kernels write into plus the Surface that shows it."""
+    def __init__(self):
+        self.pixels, self.screen_buffer = raycaster.make_frame_buffer()
+        self.surface = pygame.image.frombuffer(self.pixels, (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGBX')
+        self.depth_buffer = np.zeros(SCREEN_WIDTH, dtype=np.float32)
+
+class RenderPipeline:
+    def __init__(self, game):
+        self.game = game
+        self.snapshots = [Snapshot(), Snapshot()]
+        self.buffers = [FrameBuffer(), FrameBuffer()]
+        self.next_snapshot = self.next_buffer = 0
+        self.pending = False
+        self.jobs, self.results = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+        threading.Thread(target=self.worker, daemon=True).start()
+
+    def worker(self):
+        while True:
+            snap, buf = self.jobs.get()
+            try: self.render(snap, buf)
+            except BaseException as e: self.results.put(e); continue # Re-raised by collect(), instead of hanging the main thread
+            self.results.put((snap, buf))
+
+    def render(self, snap, buf):
+        g = self.game
+        x, y, angle, pitch = snap.pose
+        rw, rh = snap.size
+        g.render_kernel(x, y, angle, pitch, snap.world_map, snap.occupancy, snap.door_state, g.door_lock, g.door_dir, g.wall_textures, g.floor_texture, g.ceil_texture, g.floor_ao, g.row_shade, raycaster.ray_table(rw), buf.screen_buffer[:rw, :rh], buf.depth_buffer)
+        if snap.sprites is not None:
+            raycaster.sprite_pass(x, y, angle, pitch, snap.sprites, g.assets.sprite_textures, buf.screen_buffer[:rw, :rh], buf.depth_buffer)
+        if len(snap.effects): g.postfx_kernel(buf.screen_buffer[:rw, :rh], snap.effects)
+
+    def submit(self, snap):
+        buf = self.buffers[self.next_buffer]; self.next_buffer ^= 1
+        self.jobs.put((snap, buf)); self.pending = True
+
+    def collect(self):
+        done = self.results.get(); self.pending = False
+        if isinstance(done, BaseException): raise RuntimeError("render worker failed") from done
+        return done
+
+    def drain(self):
+        """Waits out the frame in flight (before the level arrays it reads are replaced)."""
+        if self.pending: self.collect()
+
+    def next_frame(self):
+        """Queues the current view and returns (rw, rh) of the newest finished frame, which it swaps into the game's buffers."""
+        snap = self.snapshots[self.next_snapshot]; self.next_snapshot ^= 1
+        snap.capture(self.game)
+        if not self.pending: # Pipeline empty (first frame, or after a level load): prime it
+            self.submit(snap); done = self.collect()
+            self.submit(snap)
+        else:
+            done = self.collect()
+            self.submit(snap)
+        g, (snap, buf) = self.game, done
+        g.frame_surface, g.screen_buffer, g.depth_buffer = buf.surface, buf.screen_buffer, buf.depth_buffer
+        return snap.size
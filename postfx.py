@@ -0,0 +1,97 @@
+import math
+import numpy as np
+from numba import prange
+from settings import *
+from raycaster import cached_jit
+
+# --- POST-PROCESSING ---
+# Full-screen effects run as one fused jitted pass over screen_buffer, driven by
+# a small descriptor array: one row per effect, [kind, p1, p2, p3, p4, p5],
+# applied in row order. A new effect is a new kind here, not another
+# full-screen blit in Game.draw.
+#
+#   EFFECT_TINT      r, g, b, amount (0-1)       blend towards a colour (damage flash)
+#   EFFECT_VIGNETTE  strength, radius            darken towards the corners
+#   EFFECT_GRADE     brightness, gamma           brightness * v^(1/gamma)
+#   EFFECT_RETRO     levels                      quantize each channel to `levels` steps
+#
+# Everything but the vignette maps a channel value to a new value, so each run
+# of those rows is folded into a 256-entry table per channel once per frame;
+# the per-pixel work is a table lookup per channel, plus a multiply and another
+# lookup for every vignette in the stack.
+
+EFFECT_TINT, EFFECT_VIGNETTE, EFFECT_GRADE, EFFECT_RETRO = 1, 2, 3, 4
+EFFECT_FIELDS = 6
+
+@cached_jit(inline='always')
+def effect_tables(effects):
+    """(segments, 3, 256) uint8 tables, one per run of per-value rows between vignettes, and the vignette rows."""
+    n = effects.shape[0]
+    vignettes = np.empty(n, dtype=np.int64); count = 0
+    for e in range(n):
+        if effects[e, 0] == EFFECT_VIGNETTE: vignettes[count] = e; count += 1
+    tables = np.empty((count + 1, 3, 256), dtype=np.uint8)
+    segment = 0
+    for e0 in range(-1, n):
+        if e0 >= 0 and effects[e0, 0] != EFFECT_VIGNETTE: continue
+        for c in range(3):
+            for v in range(256):
+                x = float(v)
+                for e in range(e0 + 1, n):
+                    kind = effects[e, 0]
+                    if kind == EFFECT_VIGNETTE: break
+                    if kind == EFFECT_TINT: x += (effects[e, 1 + c] - x) * effects[e, 4]
+                    elif kind == EFFECT_GRADE: x = 255.0 * (min(255.0, max(0.0, x)) / 255.0) ** (1.0 / effects[e, 2]) * effects[e, 1]
+                    elif kind == EFFECT_RETRO:
+                        step = 255.0 / (effects[e, 1] - 1.0); x = math.floor(x / step + 0.5) * step
+                tables[segment, c, v] = min(255, max(0, int(x)))
+        segment += 1
+    return tables, vignettes[:count]
+
+def _post_process(screen_buffer, effects):
+    width = screen_buffer.shape[0]; height = screen_buffer.shape[1]
+    tables, vignettes = effect_tables(effects)
+    # Squared distance from the centre (corners = 2) split into its column and row terms
+    dx2 = np.empty(width, dtype=np.float32); dy2 = np.empty(height, dtype=np.float32)
+    for x in range(width): dx2[x] = ((x + 0.5) / (0.5 * width) - 1.0) ** 2
+    for y in range(height): dy2[y] = ((y + 0.5) / (0.5 * height) - 1.0) ** 2
+    for y in prange(height):
+        for x in range(width):
+            r = tables[0, 0, screen_buffer[x, y, 0]]; g = tables[0, 1, screen_buffer[x, y, 1]]; b = tables[0, 2, screen_buffer[x, y, 2]]
+            for k in range(vignettes.shape[0]):
+                e = vignettes[k]
+                f = max(0.0, 1.0 - effects[e, 1] * max(0.0, dx2[x] + dy2[y] - effects[e, 2]))
+                r = tables[k + 1, 0, int(r * f)]; g = tables[k + 1, 1, int(g * f)]; b = tables[k + 1, 2, int(b * f)]
+            screen_buffer[x, y, 0] = r; screen_buffer[x, y, 1] = g; screen_buffer[x, y, 2] = b
+
+# Serial and parallel builds like the render kernel; both release the GIL for the pipelined worker
+post_process = cached_jit(nogil=True)(_post_process)
+post_process_parallel = cached_jit(parallel=True, nogil=True)(_post_process)
+
+def select_kernel(parallel=PARALLEL_RENDER):
+    return post_process_parallel if parallel else post_process
+
+class EffectStack:
+    """Preallocated descriptor rows for the post-process pass, refilled every frame."""
+    def __init__(self, capacity=8):
+        self.rows = np.zeros((capacity, EFFECT_FIELDS), dtype=np.float32)
+        self.count = 0
+
+    def clear(self): self.count = 0
+
+    def add(self, kind, *params):
+        row = self.rows[self.count]; self.count += 1
+        row[:] = 0; row[0] = kind; row[1:1 + len(params)] = params
+
+    def tint(self, color, amount): self.add(EFFECT_TINT, *color, amount)
+    def vignette(self, strength, radius=0.0): self.add(EFFECT_VIGNETTE, strength, radius)
+    def grade(self, brightness=1.0, gamma=1.0): self.add(EFFECT_GRADE, brightness, gamma)
+    def retro(self, levels): self.add(EFFECT_RETRO, levels)
+
+    def active(self): return self.rows[:self.count]
+
+def warmup(kernel):
+    """Loads (or compiles) `kernel` with the game's array types."""
+    frame = np.zeros((4, 4, 4), dtype=np.uint8).transpose(1, 0, 2)[:, :, :3] # Same strided view as the frame buffer
+    fx = EffectStack(); fx.grade(); fx.vignette(0.5); fx.tint((255, 0, 0), 0.5); fx.retro(4)
+    kernel(frame, fx.active())
@@ -0,0 +1,69 @@
+import threading
+import numpy as np
+from settings import *
+import levels
+import levelfile
+import entities
+import flowfield
+import occupancy
+
+# --- LEVEL PREFETCH ---
+# While a level is being played, the next one is staged on a background thread:
+# map copies, entity stores, flow field and any per-level textures are built
+# ahead of time, so a level transition only swaps in ready-made objects.
+
+class StagedLevel:
+    """Everything Game.init_map needs for levels.LEVELS[index], freshly built and not shared with anything."""
+    def __init__(self, index, assets):
+        self.index = index
+        self.level = level = levelfile.load(index)
+        self.world_map = level.tiles.astype(np.int32) # Switches rewrite tiles, so never the mapped file itself
+        self.door_state = np.zeros(level.size, dtype=np.float32)
+        self.door_lock = np.zeros(level.size, dtype=np.int32)
+        self.door_dir = level.door_dir.astype(np.int32)
+        self.occupancy = occupancy.build_occupancy(self.world_map)
+        self.enemies = entities.Enemies.from_tiles(level.size, level.spawns)
+        self.pickups = entities.Pickups(level.size, level.pickups[:, 0] * TILE_SIZE, level.pickups[:, 1] * TILE_SIZE, level.kinds)
+        self.flow_field = flowfield.FlowField(self.world_map)
+        self.wall_textures, self.floor_texture, self.ceil_texture = assets.level_textures(levels.LEVELS[index])
+
+class LevelPrefetcher:
+    """Stages one level at a time on a daemon thread and hands it over on take().
+
+    Counts a hit when the staged level was ready, a late hit when take() had to
+    wait for the worker, and a miss when nothing was staged for that level
+    (it is then built on the spot).
+    """
+    def __init__(self, assets, enabled=PREFETCH_LEVELS):
+        self.assets, self.enabled = assets, enabled
+        self.index, self.staged, self.thread = None, None, None
+        self.hits = self.late = self.misses = 0
+        self.last_result = None
+
+    def request(self, index):
+        """Starts staging levels.LEVELS[index] unless it already is (or there is no such level)."""
+        if not self.enabled or not 0 <= index < len(levels.LEVELS) or index == self.index: return
+        self.index, self.staged = index, None
+        self.thread = threading.Thread(target=self._stage, args=(index,), daemon=True)
+        self.thread.start()
+
+    def _stage(self, index):
+        staged = StagedLevel(index, self.assets)
+        if self.index == index: self.staged = staged # A newer request may have replaced this one meanwhile
+
+    def take(self, index):
+        """The staged level `index`, waiting for the worker if it is still building it, else one built now."""
+        if self.index == index:
+            ready = not self.thread.is_alive()
+            self.thread.join()
+            staged, self.last_result = self.staged, "hit" if ready else "late"
+            if ready: self.hits += 1
+            else: self.late += 1
+        else:
+            staged, self.last_result = None, "miss"
+            self.misses += 1
+        self.index, self.staged, self.thread = None, None, None # Staged objects are handed over, never reused
+        return staged if staged is not None else StagedLevel(index, self.assets)
+
+    def summary(self):
+        return f"prefetch {self.last_result} ({self.hits} hits, {self.late} late, {self.misses} misses)"
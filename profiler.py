@@ -0,0 +1,102 @@
+import json
+import time
+from collections import deque
+import pygame
+from settings import *
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler, self.name, self.start = profiler, name, 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.current.append((self.name, self.start, time.perf_counter() - self.start))
+
+class _NullScope:
+    __slots__ = ()
+    def __enter__(self): pass
+    def __exit__(self, *exc): pass
+
+NULL_SCOPE = _NullScope()
+
+class FrameProfiler:
+    """Named timing scopes per frame, kept for the last PROFILER_HISTORY frames.
+
+    Wrap each phase in `with profiler.scope("name"):`. While disabled, scope()
+    hands back a shared no-op object, so instrumented code costs one attribute
+    check and an empty with-block.
+    """
+    def __init__(self, capacity=PROFILER_HISTORY):
+        self.enabled = False
+        self.frames = deque(maxlen=capacity) # (start, duration, [(scope, start, duration), ...])
+        self.current = []
+        self.frame_start = 0.0
+        self.colors = {}
+        self._scopes = {}
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.current, self.frame_start = [], time.perf_counter()
+
+    def scope(self, name):
+        if not self.enabled: return NULL_SCOPE
+        s = self._scopes.get(name)
+        if s is None: s = self._scopes[name] = _Scope(self, name)
+        return s
+
+    def begin_frame(self):
+        if self.enabled: self.current, self.frame_start = [], time.perf_counter()
+
+    def end_frame(self):
+        if self.enabled: self.frames.append((self.frame_start, time.perf_counter() - self.frame_start, self.current))
+
+    def averages(self):
+        """Mean milliseconds per scope over the recorded frames, in first-seen order."""
+        totals = {}
+        for _, _, scopes in self.frames:
+            for name, _, dur in scopes: totals[name] = totals.get(name, 0.0) + dur
+        n = max(1, len(self.frames))
+        return {name: t * 1000.0 / n for name, t in totals.items()}
+
+    def dump_chrome_trace(self, path):
+        """Writes the recorded frames as a Chrome trace (chrome://tracing, Perfetto)."""
+        events = []
+        for start, dur, scopes in self.frames:
+            events.append({"name": "frame", "ph": "X", "ts": start * 1e6, "dur": dur * 1e6, "pid": 1, "tid": 1})
+            for name, s, d in scopes:
+                events.append({"name": name, "ph": "X", "ts": s * 1e6, "dur": d * 1e6, "pid": 1, "tid": 1})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(self.frames)
+
+    def color(self, name):
+        if name not in self.colors: self.colors[name] = PROFILER_COLORS[len(self.colors) % len(PROFILER_COLORS)]
+        return self.colors[name]
+
+    def draw_overlay(self, screen, font):
+        """Stacked bar per recorded frame (newest on the right) plus a legend of mean scope times."""
+        x0, y0, w, h = 10, 60, 2 * PROFILER_GRAPH_FRAMES, 120
+        ms_to_px = h / (2 * TARGET_FRAME_MS) # Two frame budgets fill the graph
+        pygame.draw.rect(screen, (0, 0, 0), (x0 - 4, y0 - 4, w + 8, h + 8))
+
+        frames = list(self.frames)[-PROFILER_GRAPH_FRAMES:]
+        for i, (_, _, scopes) in enumerate(frames):
+            x, bottom = x0 + 2 * i, y0 + h
+            for name, _, dur in scopes:
+                bar = min(int(dur * 1000.0 * ms_to_px), bottom - y0)
+                if bar > 0:
+                    pygame.draw.rect(screen, self.color(name), (x, bottom - bar, 2, bar))
+                    bottom -= bar
+        budget_y = y0 + h - int(TARGET_FRAME_MS * ms_to_px)
+        pygame.draw.line(screen, (255, 255, 255), (x0, budget_y), (x0 + w, budget_y), 1)
+
+        ly = y0 + h + 10
+        for name, ms in self.averages().items():
+            pygame.draw.rect(screen, self.color(name), (x0, ly + 4, 10, 10))
+            screen.blit(font.render(f"{name}: {ms:.2f} ms", True, (230, 230, 230)), (x0 + 16, ly))
+            ly += 18
@@ -1,63 +1,139 @@
+import os
 import math
+import hashlib
 import numpy as np
-from numba import njit
+import numba
+from numba import njit, prange
+import settings
 from settings import *
-from levels import MAP_SIZE_X, MAP_SIZE_Y  # <--- NEW IMPORT ADDED HERE
 
-@njit(fastmath=True)
-def render_kernel(player_x, player_y, player_angle, pitch, world_map, door_state, door_lock, door_dir, wall_textures, floor_texture, ceil_texture, screen_buffer, depth_buffer):
-    horizon = int(HALF_HEIGHT + pitch)
-    cos_dir = math.cos(player_angle); sin_dir = math.sin(player_angle); plane_scale = 0.66
-    ray_dir_x0 = cos_dir - (-sin_dir * plane_scale); ray_dir_y0 = sin_dir - (cos_dir * plane_scale)
-    ray_dir_x1 = cos_dir + (-sin_dir * plane_scale); ray_dir_y1 = sin_dir + (cos_dir * plane_scale)
+# --- ON-DISK JIT CACHE ---
+# Numba bakes the settings constants into the machine code, and inlines helpers
+# from other modules, but only checks the decorated function's own file for
+# staleness. So every distinct set of constants and jitted sources gets its own
+# cache folder.
+JIT_CACHE_DIR = os.environ.get("HELLSGRID_JIT_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jit_cache"))
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_source_hash = None
+
+def source_hash():
+    """Hash of every module in the game that defines jitted code (anything using cached_jit)."""
+    global _source_hash
+    if _source_hash is None:
+        h = hashlib.sha1()
+        for name in sorted(os.listdir(SOURCE_DIR)):
+            if not name.endswith(".py"): continue
+            with open(os.path.join(SOURCE_DIR, name), "rb") as f: src = f.read()
+            if b"cached_jit" in src: h.update(name.encode()); h.update(src)
+        _source_hash = h.hexdigest()
+    return _source_hash
+
+def settings_key():
+    """Short hash of every compile-time constant and jitted source the kernels depend on."""
+    consts = sorted((k, repr(v)) for k, v in vars(settings).items() if k.isupper())
+    return hashlib.sha1((repr(consts) + source_hash()).encode()).hexdigest()[:12]
+
+def cached_jit(parallel=False, **options):
+    """@njit(fastmath=True) with an on-disk cache under JIT_CACHE_DIR/<settings key>."""
+    def wrap(py_func):
+        # The cache location is picked when the dispatcher is created, so point
+        # Numba at our folder just for this decoration (serial & parallel builds
+        # of one function must not share an index).
+        previous = numba.config.CACHE_DIR
+        numba.config.CACHE_DIR = os.path.join(JIT_CACHE_DIR, settings_key(), "parallel" if parallel else "serial")
+        try: return njit(fastmath=True, parallel=parallel, cache=True, **options)(py_func)
+        finally: numba.config.CACHE_DIR = previous
+    return wrap
+
+# --- FRAME BUFFER ---
+def make_frame_buffer():
+    """Returns (frame_pixels, screen_buffer).
+
+    frame_pixels is the (H, W, 4) RGBX byte block a display Surface can wrap with
+    pygame.image.frombuffer; screen_buffer is its (W, H, 3) view the kernels write into.
+    """
+    frame_pixels = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 4), dtype=np.uint8)
+    return frame_pixels, frame_pixels.transpose(1, 0, 2)[:, :, :3]
+
+# --- RENDER PASSES ---
+# Both passes are inlined into the kernel, so the `prange` loops become real
+# parallel loops in the parallel build and plain loops in the serial one.
+# Every row / ray writes its own pixels only, so both builds output the same frame.
+
+# --- FLOOR & CEILING LOOKUP TABLES ---
+# The distance shade only depends on how far a scanline is from the horizon and
+# the corner AO only on the texel, so both are baked once per resolution.
+ROW_SHADE_SIZE = SCREEN_HEIGHT + 1 # Shade is capped at 0.85 long before |p_y| reaches this
+
+def build_floor_tables():
+    """Returns (floor_ao, row_shade): the per-texel AO multiplier and the shade per |scanline - horizon|."""
+    # 1. Distance Shading (Much darker, faster falloff), capped lower for dinginess
+    p_y = np.arange(ROW_SHADE_SIZE, dtype=np.float64); p_y[0] = 1.0
+    row_shade = np.minimum(0.85, 1.0 / (1.0 + ((0.5 * SCREEN_HEIGHT) / p_y) * 0.15))
 
+    # 2. Fake Ambient Occlusion (Deeper corners, min 0.1 instead of 0.4)
+    dist = np.abs(np.arange(TEXTURE_SIZE) - HALF_TEX) / HALF_TEX
+    edge_factor = np.maximum(dist[:, None], dist[None, :])
+    floor_ao = np.maximum(0.1, 1.0 - (edge_factor ** 4) * 0.8)
+    return np.ascontiguousarray(floor_ao), row_shade
+
+# --- CAMERA TABLES ---
+# A ray's angle off the view direction only depends on its column, so the cos / sin
+# of every column offset are tabled once per render width and each frame forms its
+# rays with one rotation. The offset's cos is also the fisheye correction.
+FOCAL_LENGTH = 0.5 / math.tan(HALF_FOV) # Projection plane distance, in screen widths
+
+_ray_tables = {}
+
+def ray_table(width, fov=FOV):
+    """(width // SCALE, 2) cos / sin of each ray's offset from the view direction, cached per (width, fov)."""
+    table = _ray_tables.get((width, fov))
+    if table is None:
+        num_rays = width // SCALE
+        offsets = -0.5 * fov + np.arange(num_rays) * (fov / num_rays)
+        table = _ray_tables[(width, fov)] = np.ascontiguousarray(np.stack((np.cos(offsets), np.sin(offsets)), axis=1))
+    return table
+
+@cached_jit(inline='always')
+def floor_pass(player_x, player_y, horizon, ray_dir_x0, ray_dir_y0, ray_dir_x1, ray_dir_y1, floor_texture, ceil_texture, floor_ao, row_shade, screen_buffer):
     # --- FLOOR & CEILING CASTING (Darker) ---
-    for y in range(0, SCREEN_HEIGHT):
+    width = screen_buffer.shape[0]; height = screen_buffer.shape[1]
+    for y in prange(0, height):
         p_y = y - horizon
         if p_y == 0: continue
         is_floor = p_y > 0
-        row_dist = (0.5 * SCREEN_HEIGHT) / abs(p_y) 
-        step_x = row_dist * (ray_dir_x1 - ray_dir_x0) / SCREEN_WIDTH
-        step_y = row_dist * (ray_dir_y1 - ray_dir_y0) / SCREEN_WIDTH
+        row_dist = (0.5 * height) / abs(p_y)
+        step_x = row_dist * (ray_dir_x1 - ray_dir_x0) / width
+        step_y = row_dist * (ray_dir_y1 - ray_dir_y0) / width
         floor_x = player_x/TILE_SIZE + row_dist * ray_dir_x0
         floor_y = player_y/TILE_SIZE + row_dist * ray_dir_y0
-        
-        for x in range(SCREEN_WIDTH):
+        shade = row_shade[min(abs(p_y) * SCREEN_HEIGHT // height, ROW_SHADE_SIZE - 1)] # Table is in full-resolution rows
+        texture = floor_texture if is_floor else ceil_texture
+
+        for x in range(width):
             tx = int(floor_x * TEXTURE_SIZE) & (TEXTURE_SIZE - 1)
             ty = int(floor_y * TEXTURE_SIZE) & (TEXTURE_SIZE - 1)
-            
-            # 1. Distance Shading (Much darker, faster falloff)
-            shade = 1.0 / (1.0 + row_dist * 0.15)
-            # Cap maximum brightness lower for dinginess
-            shade = min(0.85, shade) 
-            
-            # 2. Fake Ambient Occlusion (Deeper corners)
-            dist_x = abs(tx - HALF_TEX) / HALF_TEX
-            dist_y = abs(ty - HALF_TEX) / HALF_TEX
-            edge_factor = max(dist_x, dist_y)
-            # Deeper black in corners (min 0.1 instead of 0.4)
-            ao_mult = max(0.1, 1.0 - (edge_factor ** 4) * 0.8)
-            
-            final_shade = shade * ao_mult
+            final_shade = shade * floor_ao[tx, ty]
+
+            c = texture[tx, ty]
+            screen_buffer[x, y, 0] = int(c[0] * final_shade)
+            screen_buffer[x, y, 1] = int(c[1] * final_shade)
+            screen_buffer[x, y, 2] = int(c[2] * final_shade)
 
-            if is_floor:
-                fc = floor_texture[tx, ty]
-                screen_buffer[x, y, 0] = int(fc[0] * final_shade)
-                screen_buffer[x, y, 1] = int(fc[1] * final_shade)
-                screen_buffer[x, y, 2] = int(fc[2] * final_shade)
-            else:
-                cc = ceil_texture[tx, ty]
-                screen_buffer[x, y, 0] = int(cc[0] * final_shade)
-                screen_buffer[x, y, 1] = int(cc[1] * final_shade)
-                screen_buffer[x, y, 2] = int(cc[2] * final_shade)
-            
             floor_x += step_x; floor_y += step_y
 
+@cached_jit(inline='always')
+def wall_pass(player_x, player_y, player_angle, horizon, world_map, occupancy, door_state, wall_textures, ray_table, screen_buffer, depth_buffer):
     # --- WALL CASTING (Darker) ---
-    start_angle = player_angle - HALF_FOV
-    for ray in range(NUM_RAYS):
-        angle = start_angle + ray * DELTA_ANGLE
-        sin_a = math.sin(angle); cos_a = math.cos(angle)
+    width = screen_buffer.shape[0]; height = screen_buffer.shape[1]
+    num_rays = min(ray_table.shape[0], width // SCALE)
+    cos_dir = math.cos(player_angle); sin_dir = math.sin(player_angle)
+    tex_size = wall_textures.shape[1]; half_tex = tex_size // 2 # Atlas textures are square, power-of-two
+    map_w = world_map.shape[0]; map_h = world_map.shape[1] # Bounds come from the map itself, so any size renders without a recompile
+    for ray in prange(num_rays):
+        cos_off = ray_table[ray, 0]; sin_off = ray_table[ray, 1]
+        cos_a = cos_dir * cos_off - sin_dir * sin_off; sin_a = sin_dir * cos_off + cos_dir * sin_off
         map_x = int(player_x // TILE_SIZE); map_y = int(player_y // TILE_SIZE)
         delta_dist_x = abs(1 / (cos_a + 1e-30)); delta_dist_y = abs(1 / (sin_a + 1e-30))
         step_x = 1 if cos_a >= 0 else -1; step_y = 1 if sin_a >= 0 else -1
@@ -67,15 +143,34 @@ def render_kernel(player_x, player_y, player_angle, pitch, world_map, door_state
         hit = False; side = 0; tex_id = 1; wall_x = 0.0; final_dist = 0.0
 
         while not hit:
+            # Nothing within MAX_RAY_DIST tiles: draw no wall, like a ray that leaves the map
+            if min(side_dist_x, side_dist_y) > MAX_RAY_DIST:
+                hit = True; final_dist = 1000; tex_id = 1
+                break
+
             if side_dist_x < side_dist_y:
                 side_dist_x += delta_dist_x; map_x += step_x; side = 0
             else:
                 side_dist_y += delta_dist_y; map_y += step_y; side = 1
-            
-            if map_x < 0 or map_x >= MAP_SIZE_X or map_y < 0 or map_y >= MAP_SIZE_Y:
+
+            if map_x < 0 or map_x >= map_w or map_y < 0 or map_y >= map_h:
                 hit = True; final_dist = 1000; tex_id = 1
                 break
 
+            # The whole block is open floor: walk to its last tile on the ray without testing any of them.
+            # Same additions in the same order as the plain DDA, so the ray hits exactly the same wall; the
+            # cutoff and bounds checks above catch up on the next step.
+            block_x = map_x >> OCCUPANCY_BLOCK_SHIFT; block_y = map_y >> OCCUPANCY_BLOCK_SHIFT
+            if occupancy[block_x, block_y] == 0:
+                while True:
+                    if side_dist_x < side_dist_y:
+                        if (map_x + step_x) >> OCCUPANCY_BLOCK_SHIFT != block_x: break
+                        side_dist_x += delta_dist_x; map_x += step_x
+                    else:
+                        if (map_y + step_y) >> OCCUPANCY_BLOCK_SHIFT != block_y: break
+                        side_dist_y += delta_dist_y; map_y += step_y
+                continue
+
             cell = world_map[map_x, map_y]
             
             if cell > 0:
@@ -101,22 +196,23 @@ def render_kernel(player_x, player_y, player_angle, pitch, world_map, door_state
                     hit = True; final_dist = perp_dist; wall_x = hit_x
                     tex_id = cell
 
-        final_dist *= math.cos(angle - player_angle)
+        final_dist *= cos_off # Fisheye correction
         if final_dist < 0.05: final_dist = 0.05
         
         for s in range(SCALE):
-            if ray * SCALE + s < SCREEN_WIDTH: depth_buffer[ray * SCALE + s] = final_dist
+            if ray * SCALE + s < width: depth_buffer[ray * SCALE + s] = final_dist
 
-        line_height = int(SCREEN_HEIGHT / final_dist)
+        line_height = int(height / final_dist)
+        if line_height <= 0: continue # Under a pixel tall: nothing to draw (this is also the no-wall case)
         draw_start = -line_height // 2 + horizon; draw_end = line_height // 2 + horizon
-        draw_start_clamped = max(0, draw_start); draw_end_clamped = min(SCREEN_HEIGHT, draw_end)
-        
-        tex_x = int(wall_x * TEXTURE_SIZE)
-        if side == 0 and cos_a > 0: tex_x = TEXTURE_SIZE - tex_x - 1
-        if side == 1 and sin_a < 0: tex_x = TEXTURE_SIZE - tex_x - 1
-        tex_x = max(0, min(tex_x, TEXTURE_SIZE - 1))
-        
-        step = 1.0 * TEXTURE_SIZE / line_height
+        draw_start_clamped = max(0, draw_start); draw_end_clamped = min(height, draw_end)
+
+        tex_x = int(wall_x * tex_size)
+        if side == 0 and cos_a > 0: tex_x = tex_size - tex_x - 1
+        if side == 1 and sin_a < 0: tex_x = tex_size - tex_x - 1
+        tex_x = max(0, min(tex_x, tex_size - 1))
+
+        step = 1.0 * tex_size / line_height
         tex_pos = (draw_start_clamped - horizon + line_height / 2) * step
         
         # --- ATMOSPHERE RESTORED & DARKENED ---
@@ -127,14 +223,14 @@ def render_kernel(player_x, player_y, player_angle, pitch, world_map, door_state
         if side == 1: shade *= 0.6 
         
         # 3. Fake Ambient Occlusion (Deeper vertical edges)
-        dist_x_pixel = abs(tex_x - HALF_TEX) / HALF_TEX
+        dist_x_pixel = abs(tex_x - half_tex) / half_tex
         # Darker corners (min 0.2) and steeper curve (**6)
         ao_mult = max(0.2, 1.0 - (dist_x_pixel ** 6) * 0.8)
         
         final_shade = shade * ao_mult
 
         for y in range(draw_start_clamped, draw_end_clamped):
-            tex_y = int(tex_pos) & (TEXTURE_SIZE - 1)
+            tex_y = int(tex_pos) & (tex_size - 1)
             tex_pos += step
             color = wall_textures[tex_id, tex_x, tex_y]
             
@@ -143,7 +239,95 @@ def render_kernel(player_x, player_y, player_angle, pitch, world_map, door_state
             b = int(color[2] * final_shade)
             
             for s in range(SCALE):
-                if ray * SCALE + s < SCREEN_WIDTH:
+                if ray * SCALE + s < width:
                     screen_buffer[ray * SCALE + s, y, 0] = r
                     screen_buffer[ray * SCALE + s, y, 1] = g
-                    screen_buffer[ray * SCALE + s, y, 2] = b
\ No newline at end of file
+                    screen_buffer[ray * SCALE + s, y, 2] = b
+
+@cached_jit(nogil=True)
+def sprite_pass(player_x, player_y, player_angle, pitch, sprites, sprite_textures, screen_buffer, depth_buffer):
+    """Billboards every row of `sprites` (x, y, tex_id, width, height, centered) into the frame.
+
+    Width / height are fractions of the projected tile height; centered sprites
+    hang around the floor line, the rest stand on it. Sprites are painted far to
+    near and every column is depth-tested against the wall depth buffer, so
+    sprites half behind a wall are clipped exactly at its edge.
+    """
+    width = screen_buffer.shape[0]; height = screen_buffer.shape[1]
+    tex_size = sprite_textures.shape[1]
+    pc = math.cos(player_angle); ps = math.sin(player_angle)
+    proj = width * FOCAL_LENGTH
+    horizon = height / 2 + pitch * (height / SCREEN_HEIGHT)
+
+    n = sprites.shape[0]
+    depths = np.empty(n)
+    for i in range(n): depths[i] = (sprites[i, 0] - player_x) * pc + (sprites[i, 1] - player_y) * ps
+    order = np.argsort(depths)
+
+    for k in range(n - 1, -1, -1):
+        i = order[k]; depth = depths[i]
+        if depth <= 10: break # Everything after this is nearer still
+        lat = (sprites[i, 1] - player_y) * pc - (sprites[i, 0] - player_x) * ps
+        dist = depth / TILE_SIZE
+        scale = height / dist
+        sw = int(scale * sprites[i, 3]); sh = int(scale * sprites[i, 4])
+        if sw <= 0 or sh <= 0: continue
+        scx = int(width / 2 + (lat / depth) * proj)
+        floor_y = int(horizon + 0.5 * height / dist)
+        x0 = scx - sw // 2
+        y0 = floor_y - sh // 2 if sprites[i, 5] > 0 else floor_y - sh
+        tex = int(sprites[i, 2])
+
+        for col in range(max(0, x0), min(width, x0 + sw)):
+            if dist >= depth_buffer[col]: continue
+            tx = (col - x0) * tex_size // sw
+            for row in range(max(0, y0), min(height, y0 + sh)):
+                ty = (row - y0) * tex_size // sh
+                a = sprite_textures[tex, tx, ty, 3]
+                if a == 0: continue
+                if a == 255:
+                    for c in range(3): screen_buffer[col, row, c] = sprite_textures[tex, tx, ty, c]
+                else:
+                    for c in range(3):
+                        screen_buffer[col, row, c] = (sprite_textures[tex, tx, ty, c] * a + screen_buffer[col, row, c] * (255 - a)) // 255
+
+def _render_kernel(player_x, player_y, player_angle, pitch, world_map, occupancy, door_state, door_lock, door_dir, wall_textures, floor_texture, ceil_texture, floor_ao, row_shade, ray_table, screen_buffer, depth_buffer):
+    # Resolution comes from the buffer, so the same kernel renders scaled-down frames
+    height = screen_buffer.shape[1]
+    horizon = int(height // 2 + pitch * (height / SCREEN_HEIGHT))
+    cos_dir = math.cos(player_angle); sin_dir = math.sin(player_angle); plane_scale = 0.66
+    ray_dir_x0 = cos_dir - (-sin_dir * plane_scale); ray_dir_y0 = sin_dir - (cos_dir * plane_scale)
+    ray_dir_x1 = cos_dir + (-sin_dir * plane_scale); ray_dir_y1 = sin_dir + (cos_dir * plane_scale)
+
+    floor_pass(player_x, player_y, horizon, ray_dir_x0, ray_dir_y0, ray_dir_x1, ray_dir_y1, floor_texture, ceil_texture, floor_ao, row_shade, screen_buffer)
+    wall_pass(player_x, player_y, player_angle, horizon, world_map, occupancy, door_state, wall_textures, ray_table, screen_buffer, depth_buffer)
+
+# --- KERNEL BUILDS ---
+# Same source, two builds: the serial one for single-core machines and as a
+# reference, the parallel one spreads scanlines and rays across RENDER_THREADS.
+# Both (and the sprite pass) release the GIL, so the pipelined render worker
+# runs them while the main thread simulates the next frame.
+render_kernel = cached_jit(nogil=True)(_render_kernel)
+render_kernel_parallel = cached_jit(parallel=True, nogil=True)(_render_kernel)
+
+def select_kernel(parallel=PARALLEL_RENDER, threads=RENDER_THREADS):
+    """Returns the kernel to render with, sizing Numba's thread pool (0 = every core)."""
+    if not parallel: return render_kernel
+    numba.set_num_threads(threads if 0 < threads <= numba.config.NUMBA_NUM_THREADS else numba.config.NUMBA_NUM_THREADS)
+    return render_kernel_parallel
+
+def warmup(kernel):
+    """Loads (or compiles) `kernel` and the sprite pass by rendering one throwaway frame with the game's array types."""
+    world_map = np.ones((3, 3), dtype=np.int32)
+    occupancy = np.ones((1, 1), dtype=np.uint8)
+    door_state = np.zeros((3, 3), dtype=np.float32)
+    door_lock = np.zeros((3, 3), dtype=np.int32)
+    door_dir = np.zeros((3, 3), dtype=np.int32)
+    wall_textures = np.zeros((2, TEXTURE_SIZE, TEXTURE_SIZE, 3), dtype=np.uint8)
+    flat_texture = np.zeros((TEXTURE_SIZE, TEXTURE_SIZE, 3), dtype=np.uint8)
+    _, screen_buffer = make_frame_buffer()
+    depth_buffer = np.zeros(SCREEN_WIDTH, dtype=np.float32)
+    floor_ao, row_shade = build_floor_tables()
+    sprite_textures = np.zeros((1, SPRITE_TEX_SIZE, SPRITE_TEX_SIZE, 4), dtype=np.uint8)
+    sprite_pass(1.5 * TILE_SIZE, 1.5 * TILE_SIZE, 0.0, 0.0, np.zeros((0, 6)), sprite_textures, screen_buffer, depth_buffer)
+    kernel(1.5 * TILE_SIZE, 1.5 * TILE_SIZE, 0.0, 0.0, world_map, occupancy, door_state, door_lock, door_dir, wall_textures, flat_texture, flat_texture, floor_ao, row_shade, ray_table(SCREEN_WIDTH), screen_buffer, depth_buffer)
@@ -0,0 +1,36 @@
+from settings import *
+
+class DynamicResolution:
+    """Picks the internal render size from a moving average of recent frame times.
+
+    The kernel renders into the top-left (width, height) corner of the frame
+    buffer and the result is upscaled to the window. The scale moves one
+    DYNAMIC_RES_STEP at a time with a cooldown, so it doesn't oscillate.
+    """
+    def __init__(self, enabled=DYNAMIC_RES, target_ms=TARGET_FRAME_MS, min_scale=DYNAMIC_RES_MIN_SCALE):
+        self.enabled = enabled
+        self.target_ms = target_ms
+        self.min_scale = min_scale
+        self.scale = 1.0
+        self.avg_ms = 0.0
+        self.cooldown = 0
+
+    def update(self, frame_ms):
+        if not self.enabled:
+            self.scale, self.avg_ms, self.cooldown = 1.0, 0.0, 0
+            return
+        self.avg_ms += (frame_ms - self.avg_ms) * 0.1
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        elif self.avg_ms > self.target_ms * 0.9 and self.scale > self.min_scale:
+            # Over budget: drop quickly
+            self.scale, self.cooldown = max(self.min_scale, self.scale - DYNAMIC_RES_STEP), 15
+        elif self.avg_ms < self.target_ms * 0.6 and self.scale < 1.0:
+            # Plenty of headroom: climb back slowly
+            self.scale, self.cooldown = min(1.0, self.scale + DYNAMIC_RES_STEP), 60
+
+    @property
+    def size(self):
+        """Internal (width, height); width stays a multiple of SCALE so every ray covers whole columns."""
+        width = max(SCALE, int(SCREEN_WIDTH * self.scale) // SCALE * SCALE)
+        return width, max(1, int(SCREEN_HEIGHT * self.scale))
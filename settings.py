@@ -4,9 +4,19 @@ import math
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 HUD_HEIGHT = 100 
+HUD_TEXT_CACHE = 256  # Rendered HUD strings kept (font, text, color)
 HALF_HEIGHT = SCREEN_HEIGHT // 2
 GAME_TITLE = "HELL'S GRID: ALPHA EDITION"
-FPS = 60
+FPS = 60   # Render cap (0 = uncapped)
+
+# --- SIMULATION ---
+# Gameplay advances in fixed ticks. Speeds and rates in this file are per second
+# and durations in ms; the per-tick steps the simulation actually uses are
+# derived from them at the bottom, so TICK_RATE changes the step size only, not
+# how fast the game plays.
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5   # After a long stall, drop the backlog instead of fast-forwarding through it
 
 # --- RAYCASTING ENGINE CONSTANTS ---
 TILE_SIZE = 64
@@ -18,27 +28,79 @@ NUM_RAYS = SCREEN_WIDTH // 2
 DELTA_ANGLE = FOV / NUM_RAYS
 DIST = NUM_RAYS / (2 * math.tan(HALF_FOV))
 SCALE = SCREEN_WIDTH // NUM_RAYS
+MAX_RAY_DIST = 64.0     # Tiles a wall ray travels before giving up (open arenas draw no wall past this)
+OCCUPANCY_BLOCK_SHIFT = 3  # Coarse occupancy blocks are 2^shift tiles square (8x8)
+OCCUPANCY_GRID = False  # Let rays skip empty blocks without reading world_map; only pays off on large open maps (see bench_occupancy)
+SPRITE_TEX_SIZE = 256   # Enemy & pickup sprites are resampled to this for the sprite pass
+SPRITE_KERNEL = True    # Rasterize sprites in Numba (False = legacy pygame.transform path)
+SPRITE_CACHE_BUDGET = 32 * 1024 * 1024  # Bytes of scaled sprite Surfaces kept for the legacy path
+SPRITE_CACHE_STEPS = 8  # Cached heights per doubling (higher = finer sizes, more memory)
+SPRITE_CACHE_PREWARM = 256  # Heights up to this are scaled at load time (legacy sprite path only)
+
+# --- MULTI-CORE RENDERING ---
+PARALLEL_RENDER = True  # Spread scanlines & rays across cores
+RENDER_THREADS = 0      # Worker threads for the kernel (0 = every core)
+PIPELINED_RENDER = False  # Render frame N on a worker thread while frame N+1 simulates (one frame of latency)
+
+# --- POST-PROCESSING (one fused pass over the 3D view, see postfx.py) ---
+POSTFX_BRIGHTNESS = 1.0  # Multiplier after gamma
+POSTFX_GAMMA = 1.0       # > 1 brightens the shadows
+POSTFX_VIGNETTE = 0.0    # Corner darkening strength (0 = off)
+POSTFX_VIGNETTE_RADIUS = 0.3  # Squared distance from the centre (corners = 2) where the vignette starts
+POSTFX_RETRO_LEVELS = 0  # Quantize each channel to this many levels for a retro palette (0 = off)
+
+# --- DOORS (see doors.py) ---
+DOOR_SPEED = 1.8        # Doorways a door slides per second
+DOOR_UNLOCK_MS = 1000   # From pressing the switch to the door starting to open
+DOOR_CLOSE_MS = 5000    # How long a door stands open before closing (once the doorway is clear)
+
+# --- LEVEL STREAMING ---
+PREFETCH_LEVELS = True  # Stage the next level (map, entities, textures) on a background thread during play
+
+# --- DYNAMIC RESOLUTION ---
+DYNAMIC_RES = False            # Default for the OPTIONS toggle / --dynamic-res
+DYNAMIC_RES_MIN_SCALE = 0.5    # Never render below half the window size
+DYNAMIC_RES_STEP = 0.125       # Scale change per adjustment
+TARGET_FRAME_MS = 1000 / (FPS or TICK_RATE)   # Frame budget the scaler tries to hold
+
+# --- FRAME PROFILER (F3 overlay, F4 saves a Chrome trace) ---
+PROFILER_HISTORY = 600       # Frames kept in the ring buffer
+PROFILER_GRAPH_FRAMES = 150  # Frames shown in the overlay graph
+PROFILER_COLORS = [(230, 60, 60), (60, 200, 90), (70, 130, 240), (240, 200, 40), (200, 90, 220), (60, 210, 220), (240, 140, 50), (160, 160, 160), (120, 80, 40), (255, 255, 255)]
 
 # --- PLAYER CONTROLS & STATS ---
 MOUSE_SENSITIVITY = 0.002
 MOUSE_PITCH_SENSITIVITY = 2.0 
-PLAYER_SPEED = 2.5 
+PLAYER_SPEED = 150.0  # px per second (strafing at 70%)
+WEAPON_BOB_SPEED = 12.0  # Bob phase (radians) per second while walking
 PLAYER_SIZE = 15
 
 MAX_HEALTH = 100
 MAX_AMMO = 50 
 
 # --- WEAPON SETTINGS ---
-FIRE_RATE = 100       
+FIRE_RATE = 100       # ms between shots
+RELOAD_MS = 1000
 RECOIL_FORCE = 12     
+RECOIL_RECOVERY = 120.0  # Recoil px recovered per second
+MUZZLE_FLASH_MS = 83
+TRACER_MS = 83
+DAMAGE_FLASH_FADE = 300.0  # Damage flash alpha lost per second
+SCREEN_SHAKE_DECAY = 0.9  # Fraction of the screen shake kept every 1/60 s
 SHAKE_INTENSITY = 10  
 GUN_SCALE = 0.6       
+PELLETS = 1           # Hitscan rays per shot
+PELLET_SPREAD = 0.0   # Max angle off the crosshair per pellet (radians)
+PELLET_DAMAGE = 20
+HIT_RADIUS = 30       # How far off a ray (px) an enemy still gets hit
 
 # --- ENEMY SETTINGS ---
-ENEMY_SPEED = 1.5 
+ENEMY_SPEED = 90.0    # px per second
 ENEMY_SIZE = 20
 ENEMY_HEALTH = 100
-ENEMY_DAMAGE = 0.5 
+ENEMY_DAMAGE = 30.0   # Health per second of contact, per enemy
+ENEMY_ANIM_MS = 350   # Walk-cycle frame length
+FLOW_FIELD_RADIUS = 128 # Path steps the enemy flow field reaches from the player; enemies further away steer straight
 
 # --- UI COLORS (DARK & DINGY) ---
 # Deep blood reds and dark, oxidized metals
@@ -51,6 +113,25 @@ MENU_TEXT_HOVER = (200, 30, 30)
 CROSSHAIR_COLOR = (180, 40, 40) # Blood red crosshair
 
 # --- FACE ANIMATION TIMERS ---
-FACE_IDLE_MIN = 60   
-FACE_IDLE_MAX = 180  
-FACE_LOOK_TIME = 30
\ No newline at end of file
+FACE_IDLE_MIN = 1000  # ms
+FACE_IDLE_MAX = 3000
+FACE_LOOK_TIME = 500
+LOADING_FADE_SPEED = 300.0  # Loading screen alpha per second
+
+# --- PER-TICK STEPS (derived from the rates above; don't edit) ---
+def ticks(ms):
+    """Whole ticks closest to `ms`, at least one."""
+    return max(1, round(ms / TICK_MS))
+
+PLAYER_STEP = PLAYER_SPEED / TICK_RATE
+ENEMY_STEP = ENEMY_SPEED / TICK_RATE
+ENEMY_DAMAGE_STEP = ENEMY_DAMAGE / TICK_RATE
+DOOR_STEP = DOOR_SPEED / TICK_RATE
+WEAPON_BOB_STEP = WEAPON_BOB_SPEED / TICK_RATE
+RECOIL_RECOVERY_STEP = RECOIL_RECOVERY / TICK_RATE
+DAMAGE_FLASH_FADE_STEP = DAMAGE_FLASH_FADE / TICK_RATE
+SCREEN_SHAKE_DECAY_STEP = SCREEN_SHAKE_DECAY ** (60 / TICK_RATE)
+LOADING_FADE_STEP = LOADING_FADE_SPEED / TICK_RATE
+RELOAD_TICKS, MUZZLE_FLASH_TICKS, TRACER_TICKS = ticks(RELOAD_MS), ticks(MUZZLE_FLASH_MS), ticks(TRACER_MS)
+ENEMY_ANIM_TICKS = ticks(ENEMY_ANIM_MS)
+FACE_IDLE_MIN_TICKS, FACE_IDLE_MAX_TICKS, FACE_LOOK_TICKS = ticks(FACE_IDLE_MIN), ticks(FACE_IDLE_MAX), ticks(FACE_LOOK_TIME)
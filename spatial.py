@@ -0,0 +1,113 @@
+import numpy as np
+from settings import *
+from raycaster import cached_jit
+
+# --- SPATIAL HASH ---
+# Entities are bucketed by the world_map tile they stand on: every tile keeps
+# an intrusive doubly linked list (head per tile, next / prev per entity slot),
+# so moving an entity to another tile, or dropping a dead one, is O(1) and
+# queries only walk the handful of tiles they overlap.
+
+@cached_jit(inline='always')
+def cell_index(x, y, width, height):
+    cx = min(max(int(x // TILE_SIZE), 0), width - 1)
+    cy = min(max(int(y // TILE_SIZE), 0), height - 1)
+    return cx * height + cy
+
+@cached_jit(inline='always')
+def grid_link(head, nxt, prv, cell, i, c):
+    cell[i], prv[i], nxt[i] = c, -1, head[c]
+    if head[c] >= 0: prv[head[c]] = i
+    head[c] = i
+
+@cached_jit(inline='always')
+def grid_unlink(head, nxt, prv, cell, i):
+    c = cell[i]
+    if c < 0: return
+    if prv[i] >= 0: nxt[prv[i]] = nxt[i]
+    else: head[c] = nxt[i]
+    if nxt[i] >= 0: prv[nxt[i]] = prv[i]
+    cell[i] = -1
+
+@cached_jit(inline='always')
+def grid_move(head, nxt, prv, cell, i, x, y, width, height):
+    """Relinks slot i if (x, y) is on another tile than the one it is filed under."""
+    c = cell_index(x, y, width, height)
+    if c != cell[i]:
+        grid_unlink(head, nxt, prv, cell, i)
+        grid_link(head, nxt, prv, cell, i, c)
+
+@cached_jit()
+def grid_build(head, nxt, prv, cell, x, y, active, width, height):
+    head[:] = -1; cell[:] = -1
+    for i in range(x.shape[0]):
+        if active[i]: grid_link(head, nxt, prv, cell, i, cell_index(x[i], y[i], width, height))
+
+@cached_jit()
+def grid_near(head, nxt, x, y, width, height, px, py, radius, out):
+    """Writes the slots within `radius` of (px, py) to out, returns how many."""
+    count = 0
+    for cx in range(max(int((px - radius) // TILE_SIZE), 0), min(int((px + radius) // TILE_SIZE), width - 1) + 1):
+        for cy in range(max(int((py - radius) // TILE_SIZE), 0), min(int((py + radius) // TILE_SIZE), height - 1) + 1):
+            i = head[cx * height + cy]
+            while i >= 0:
+                if (x[i] - px) ** 2 + (y[i] - py) ** 2 < radius * radius:
+                    out[count] = i; count += 1
+                i = nxt[i]
+    return count
+
+@cached_jit()
+def grid_along(head, nxt, x, y, width, height, ox, oy, dir_x, dir_y, half_width, max_dist):
+    """Nearest slot ahead of (ox, oy) within `half_width` of the ray, or -1.
+
+    Steps through the tiles the ray crosses (DDA) and scans the tiles within
+    half_width around each. Stops as soon as the next tile starts beyond the
+    best hit so far, so a hit right in front costs a few tiles whatever the map size.
+    """
+    map_x, map_y = int(ox // TILE_SIZE), int(oy // TILE_SIZE)
+    step_x, step_y = (1 if dir_x >= 0 else -1), (1 if dir_y >= 0 else -1)
+    delta_x = abs(TILE_SIZE / dir_x) if dir_x != 0 else 1e30
+    delta_y = abs(TILE_SIZE / dir_y) if dir_y != 0 else 1e30
+    side_x = (((map_x + 1) * TILE_SIZE - ox) if dir_x >= 0 else (ox - map_x * TILE_SIZE)) / abs(dir_x) if dir_x != 0 else 1e30
+    side_y = (((map_y + 1) * TILE_SIZE - oy) if dir_y >= 0 else (oy - map_y * TILE_SIZE)) / abs(dir_y) if dir_y != 0 else 1e30
+    reach = int(half_width // TILE_SIZE) + 1
+    best, best_t, t = -1, max_dist, 0.0
+    while t < best_t and 0 <= map_x < width and 0 <= map_y < height:
+        for cx in range(max(map_x - reach, 0), min(map_x + reach, width - 1) + 1):
+            for cy in range(max(map_y - reach, 0), min(map_y + reach, height - 1) + 1):
+                i = head[cx * height + cy]
+                while i >= 0:
+                    rx, ry = x[i] - ox, y[i] - oy
+                    along = rx * dir_x + ry * dir_y
+                    if 0 < along < best_t and abs(ry * dir_x - rx * dir_y) < half_width: best, best_t = i, along
+                    i = nxt[i]
+        if side_x < side_y: t = side_x; side_x += delta_x; map_x += step_x
+        else: t = side_y; side_y += delta_y; map_y += step_y
+    return best
+
+class SpatialGrid:
+    """Tile-aligned spatial hash over the x / y columns of one entity store.
+
+    The store relinks slots itself as they move (see entities.step_enemies) and
+    calls remove() when one dies or is picked up.
+    """
+    def __init__(self, shape, x, y, active):
+        self.width, self.height = shape
+        self.x, self.y = x, y
+        self.head = np.full(self.width * self.height, -1, dtype=np.int32) # Slot and tile indices fit int32: 4 B per tile instead of 8
+        self.next = np.full(len(x), -1, dtype=np.int32)
+        self.prev = np.full(len(x), -1, dtype=np.int32)
+        self.cell = np.full(len(x), -1, dtype=np.int32)
+        self.found = np.empty(len(x), dtype=np.int64)
+        grid_build(self.head, self.next, self.prev, self.cell, x, y, active, self.width, self.height)
+
+    def remove(self, i):
+        grid_unlink(self.head, self.next, self.prev, self.cell, i)
+
+    def near(self, px, py, radius):
+        """Slots within `radius` of (px, py), as a view into a reused buffer."""
+        return self.found[:grid_near(self.head, self.next, self.x, self.y, self.width, self.height, float(px), float(py), float(radius), self.found)]
+
+    def along(self, ox, oy, angle, half_width, max_dist=np.inf):
+        """Nearest slot ahead of (ox, oy) in direction `angle` within half_width of the ray, or -1."""
+        return grid_along(self.head, self.next, self.x, self.y, self.width, self.height, float(ox), float(oy), np.cos(angle), np.sin(angle), float(half_width), float(max_dist))